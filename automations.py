@@ -4,12 +4,39 @@ Handles creation, storage, and execution of show automation schedules.
 """
 
 import json
+import functools
 import threading
 import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Callable, Any
 
 
+# Indexed by datetime.weekday()
+DAY_NAMES = ('Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday')
+
+
+@functools.lru_cache(maxsize=512)
+def _minutes_of(time_str: str) -> int:
+    """Convert time string 'HH:MM AM/PM' to minutes since midnight.
+
+    Memoized: every scheduler pass converts the same few schedule strings.
+    """
+    try:
+        # Parse "10:30 AM" or "2:45 PM"
+        time_part, period = time_str.rsplit(' ', 1)
+        hours, minutes = map(int, time_part.split(':'))
+        
+        # Convert to 24-hour format
+        if period.upper() == 'PM' and hours != 12:
+            hours += 12
+        elif period.upper() == 'AM' and hours == 12:
+            hours = 0
+        
+        return hours * 60 + minutes
+    except Exception:
+        return 0
+
+
 class ShowAutomation:
     """Represents a single show automation with schedule and times."""
     
@@ -105,20 +132,7 @@ class AutomationManager:
     
     def _time_to_minutes(self, time_str: str) -> int:
         """Convert time string 'HH:MM AM/PM' to minutes since midnight."""
-        try:
-            # Parse "10:30 AM" or "2:45 PM"
-            time_part, period = time_str.rsplit(' ', 1)
-            hours, minutes = map(int, time_part.split(':'))
-            
-            # Convert to 24-hour format
-            if period.upper() == 'PM' and hours != 12:
-                hours += 12
-            elif period.upper() == 'AM' and hours == 12:
-                hours = 0
-            
-            return hours * 60 + minutes
-        except Exception:
-            return 0
+        return _minutes_of(time_str)
     
     def _get_current_time_minutes(self) -> int:
         """Get current time as minutes since midnight."""
@@ -127,18 +141,27 @@ class AutomationManager:
     
     def _get_current_day_name(self) -> str:
         """Get current day name (e.g., 'Monday')."""
-        day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        return day_names[datetime.now().weekday()]
+        return DAY_NAMES[datetime.now().weekday()]
+    
+    def _snapshot(self) -> tuple[int, str]:
+        """Get (minutes since midnight, day name) from a single clock read."""
+        now = datetime.now()
+        return now.hour * 60 + now.minute, DAY_NAMES[now.weekday()]
     
-    def _check_automation_trigger(self, automation: ShowAutomation) -> tuple[bool, bool]:
+    def _check_automation_trigger(self, automation: ShowAutomation,
+                                  now: tuple[int, str] | None = None) -> tuple[bool, bool]:
         """
         Check if an automation should trigger and what action (start/stop).
         
+        Args:
+            automation: Automation to check
+            now: Optional `_snapshot()` result to check against, so one loop
+                pass can reuse a single clock read for every automation
+        
         Returns:
             (should_trigger, is_start) - (True if triggered, True if start else stop)
         """
-        current_day = self._get_current_day_name()
-        current_minutes = self._get_current_time_minutes()
+        current_minutes, current_day = now if now is not None else self._snapshot()
         
         # Check if today is a scheduled day
         if current_day not in automation.days:
@@ -172,9 +195,10 @@ class AutomationManager:
         """Background loop that checks automations and triggers callbacks."""
         while self._scheduler_running:
             try:
+                now = self._snapshot()
                 # Check each automation
                 for automation in self.automations:
-                    should_trigger, is_start = self._check_automation_trigger(automation)
+                    should_trigger, is_start = self._check_automation_trigger(automation, now)
                     
                     if should_trigger:
                         if is_start and self._active_automation != automation:
@@ -196,7 +220,7 @@ class AutomationManager:
                 
                 # Check if we need to stop current automation
                 if self._active_automation:
-                    should_trigger, is_start = self._check_automation_trigger(self._active_automation)
+                    should_trigger, is_start = self._check_automation_trigger(self._active_automation, now)
                     if not should_trigger and not is_start:
                         # Time has passed, trigger stop
                         self._active_automation = None
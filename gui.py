@@ -46,7 +46,7 @@ def _hlog(msg: str):
 try:
     from serial_helper import list_serial_ports, SerialManager
 except Exception:
-    def list_serial_ports():
+    def list_serial_ports(refresh=False):
         return []
 
     SerialManager = None
@@ -269,7 +269,8 @@ class AudioFrequencyVisualizer(ttk.Frame):
                         b0 = max(1, min(b0, spec.size - 1))
                         b1 = max(b0 + 1, min(b1, spec.size))
                         s = spec[b0:b1]
-                        rms = float(np.sqrt(np.mean(s * s)))
+                        # dot() reduces without an s*s temporary
+                        rms = float(np.sqrt(np.dot(s, s) / s.size))
                         band_db[i] = 20.0 * np.log10(rms + 1e-7)
 
                     # More sensitive mapping => more visible movement on quiet inputs
@@ -999,7 +1000,7 @@ class App(tk.Tk):
         # allow manual typing of a COM port (e.g., COM5) in case the adapter isn't detected
         self.serial_port_combo = ttk.Combobox(serial_frame, textvariable=self.serial_port_var, state="normal")
         self.serial_port_combo.pack(side=tk.LEFT, fill=tk.X, expand=True)
-        ttk.Button(serial_frame, text="Refresh", command=self._populate_serial_ports).pack(side=tk.RIGHT, padx=(6,0))
+        ttk.Button(serial_frame, text="Refresh", command=lambda: self._populate_serial_ports(refresh=True)).pack(side=tk.RIGHT, padx=(6,0))
 
         # Note: manual port entry removed — users should pick a port from the combobox
 
@@ -1178,10 +1179,10 @@ class App(tk.Tk):
 
     # Theme support removed: use system/default Tk theme and colors
 
-    def _populate_serial_ports(self):
+    def _populate_serial_ports(self, refresh: bool = False):
         ports = []
         try:
-            ports = list_serial_ports()
+            ports = list_serial_ports(refresh=refresh)
         except Exception:
             ports = []
 
@@ -1,11 +1,23 @@
 import os
 import sys
 import json
-import base64
 import datetime
-from typing import Dict, Optional, Tuple
+from typing import Dict, Tuple
 
 
+# Expiry checks run on every license polling tick; keep the timezone and
+# grace-period constants at module scope instead of rebuilding them per call.
+_UTC = datetime.timezone.utc
+_GRACE = datetime.timedelta(days=3)
+_GRACE_SECONDS = _GRACE.total_seconds()
+
+# Status by feature flags, indexed by (f1 << 2) | (f2 << 1) | f3.
+# Precedence: f1=trial, then f2=subscription, then f3=perpetual.
+_STATUS_TABLE = (
+    'invalid', 'perpetual', 'subscription', 'subscription',
+    'trial', 'trial', 'trial', 'trial',
+)
+
 def _is_pyinstaller_bundle():
     """Check if running inside a PyInstaller bundle."""
     return getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS')
@@ -91,7 +103,7 @@ def _log_message(msg: str) -> None:
         if not d:
             return
         lf = os.path.join(d, 'license_debug.log')
-        ts = datetime.datetime.now(datetime.timezone.utc).astimezone().isoformat()
+        ts = datetime.datetime.now(_UTC).astimezone().isoformat()
         with open(lf, 'a', encoding='utf-8') as f:
             f.write(f"{ts} - {msg}\n")
     except Exception:
@@ -147,6 +159,26 @@ def _candidate_paths():
     return paths
 
 
+def _existing_files(paths):
+    """Return the entries of `paths` that are regular files, in order.
+
+    A handful of local stats is cheaper than any thread hand-off, so they
+    run sequentially. Duplicates are dropped.
+    """
+    found = []
+    seen = set()
+    for p in paths:
+        if p in seen:
+            continue
+        seen.add(p)
+        try:
+            if os.path.isfile(p):
+                found.append(p)
+        except Exception:
+            pass
+    return found
+
+
 def load_license() -> Dict[str, str]:
     """Load license.json if present; return empty dict if missing/invalid.
 
@@ -209,10 +241,8 @@ def load_license() -> Dict[str, str]:
     # Fallback to scanning candidate paths (legacy)
     # If primary existed but was corrupted/truncated, try to find a valid
     # copy elsewhere (e.g., APPDATA) and migrate it into primary.
-    for p in _candidate_paths():
+    for p in _existing_files(_candidate_paths()):
         try:
-            if not os.path.exists(p):
-                continue
             with open(p, 'r', encoding='utf-8') as f:
                 data = json.load(f)
                 if isinstance(data, dict):
@@ -438,22 +468,20 @@ def validate_saved_license(pubkey: str, v: int = 2, require_machine_check: bool
             expires = getattr(lk, 'expires', None)
             if expires is not None:
                 # ensure timezone-aware comparison; assume expires is aware or naive as UTC
-                now = datetime.datetime.now(datetime.timezone.utc)
+                now = datetime.datetime.now(_UTC)
                 try:
                     if expires.tzinfo is None:
                         # treat as UTC
-                        expires_dt = expires.replace(tzinfo=datetime.timezone.utc)
+                        expires_dt = expires.replace(tzinfo=_UTC)
                     else:
                         expires_dt = expires
                 except Exception:
                     expires_dt = expires
 
                 # valid if now <= expires_dt OR within grace_days after expiry
-                if now <= expires_dt:
-                    pass
-                else:
-                    grace_limit = expires_dt + datetime.timedelta(days=3)
-                    if now <= grace_limit:
+                delta = (expires_dt - now).total_seconds()
+                if delta < 0:
+                    if delta >= -_GRACE_SECONDS:
                         # within grace period: accept but warn
                         return (True, f'License expired but within 3-day grace period.')
                     else:
@@ -545,21 +573,19 @@ def get_saved_license_status(pubkey: str, v: int = 2, require_machine_check: boo
             try:
                 expires = getattr(lk, 'expires', None)
                 if expires is not None:
-                    now = datetime.datetime.now(datetime.timezone.utc)
+                    now = datetime.datetime.now(_UTC)
                     try:
                         if expires.tzinfo is None:
-                            expires_dt = expires.replace(tzinfo=datetime.timezone.utc)
+                            expires_dt = expires.replace(tzinfo=_UTC)
                         else:
                             expires_dt = expires
                     except Exception:
                         expires_dt = expires
 
-                    if now <= expires_dt:
-                        # valid
-                        pass
-                    else:
-                        grace_limit = expires_dt + datetime.timedelta(days=3)
-                        if now <= grace_limit:
+                    # delta >= 0: valid; within grace: warn; otherwise expired
+                    delta = (expires_dt - now).total_seconds()
+                    if delta < 0:
+                        if delta >= -_GRACE_SECONDS:
                             out['message'] = f'License expired but within 3-day grace period.'
                             # do not mark invalid; leave status based on features
                         else:
@@ -573,15 +599,10 @@ def get_saved_license_status(pubkey: str, v: int = 2, require_machine_check: boo
                 out['message'] = 'Could not determine expiry.'
 
         # Decide status by your mapping: f1=trial, f2=subscription, f3=perpetual
-        if out['f1']:
-            out['status'] = 'trial'
-        elif out['f2']:
-            out['status'] = 'subscription'
-        elif out['f3']:
-            out['status'] = 'perpetual'
-        else:
+        idx = (out['f1'] << 2) | (out['f2'] << 1) | out['f3']
+        out['status'] = _STATUS_TABLE[idx]
+        if not idx:
             # no known features set; treat as invalid
-            out['status'] = 'invalid'
             out['message'] = out.get('message') or 'No known license features set.'
 
         return out
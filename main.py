@@ -3,16 +3,21 @@ import sounddevice as sd
 import queue
 import sys
 import json
-import datetime
+import time
 import re
 import threading
+import functools
 from typing import Callable, Optional, List
-import tempfile
-import wave
 try:
     import numpy as np
 except Exception:
     np = None
+# Optional faster JSON decoder for Vosk results; stdlib json otherwise.
+try:
+    import orjson
+    _json_loads = orjson.loads
+except Exception:
+    _json_loads = json.loads
 try:
     try:
         # Prefer a fixed local implementation if present
@@ -28,6 +33,8 @@ __version__ = "1.0b5"
 # Configuration
 DEFAULT_MODEL_PATH = "model"
 SAMPLE_RATE = 16000
+# Longest stretch of audio kept for speaker matching of a single utterance
+UTTERANCE_BUFFER_SECONDS = 30
 
 # Optional audio monitor hook (used by GUI for visualization).
 # Signature: fn(mono_int16: "np.ndarray", samplerate: int) -> None
@@ -35,6 +42,11 @@ SAMPLE_RATE = 16000
 AUDIO_MONITOR = None
 
 
+# (relpath, cwd) -> resolved path; only paths that exist are cached so a file
+# dropped in place later is still picked up.
+_RESOURCE_PATH_CACHE = {}
+
+
 def _resource_path(relpath: str) -> str:
     """Resolve a resource file path, preferring files placed next to the exe or
     the current working directory, then the PyInstaller extraction folder, and
@@ -42,7 +54,31 @@ def _resource_path(relpath: str) -> str:
 
     This allows distributing data files (like `bad_words.txt`) next to a
     onefile exe in `dist` and have the running app pick them up.
+
+    Results are memoized per working directory; call
+    `_resource_path.cache_clear()` to force a fresh lookup.
     """
+    try:
+        key = (relpath, os.getcwd())
+    except Exception:
+        key = (relpath, None)
+    cached = _RESOURCE_PATH_CACHE.get(key)
+    if cached is not None:
+        return cached
+    p = _locate_resource(relpath)
+    try:
+        if os.path.exists(p):
+            _RESOURCE_PATH_CACHE[key] = p
+    except Exception:
+        pass
+    return p
+
+
+_resource_path.cache_clear = _RESOURCE_PATH_CACHE.clear
+
+
+def _locate_resource(relpath: str) -> str:
+    """Uncached search behind `_resource_path`."""
     # 1) directory of the launched executable (works when user places files next to exe)
     try:
         exe_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
@@ -90,7 +126,11 @@ BLEEP_SETTINGS = {
     "mask_char": "*",
     "custom_text": "****",
 }
-q = queue.Queue()
+# Audio chunks from the stream callback (single producer) to `_run_loop`
+# (single consumer). SimpleQueue is implemented in C and never takes a
+# Python-level mutex/condition on put, so the PortAudio thread cannot block
+# on it.
+q = queue.SimpleQueue()
 
 # Load bad words and helper to bleep them
 def load_bad_words(path="bad_words.txt"):
@@ -99,9 +139,21 @@ def load_bad_words(path="bad_words.txt"):
         # resolve path (so packaged exe can load a file placed next to the exe,
         # current working directory, PyInstaller _MEIPASS, or module dir)
         p = path if os.path.isabs(path) else _resource_path(path)
+        words = set()
         with open(p, encoding="utf-8") as f:
-            words = {line.strip().lower() for line in f if line.strip() and not line.strip().startswith("#")}
-            return words
+            for line in f:
+                w = line.strip()
+                if w and not w.startswith("#"):
+                    # normalize once here; matching is case-insensitive and
+                    # never lowercases caption tokens
+                    words.add(w.lower())
+        # compile the matchers now rather than on the first caption; the
+        # entry is keyed by this set object, which callers assign to BAD_WORDS
+        try:
+            _bad_words_patterns(words)
+        except Exception:
+            pass
+        return words
     except Exception:
         return set()
 
@@ -117,6 +169,105 @@ def _ensure_bad_words():
 
 _WORD_RE = re.compile(r"\b\w+(?:[-']\w+)*\b", re.UNICODE)
 
+
+@functools.lru_cache(maxsize=8)
+def _bad_words_regex(words: frozenset, ascii_only: bool = False):
+    """Compile one case-insensitive alternation matching any entry of `words`.
+
+    The lookarounds reproduce `_WORD_RE` token boundaries, so an entry only
+    matches a whole token (e.g. "law" does not match inside "mother-in-law").
+    Entries that could never be a single token are skipped. Cached by the
+    frozen word set so the pattern is rebuilt only when the list changes.
+
+    With `ascii_only`, word characters and case folding use ASCII rules,
+    which is cheaper and equivalent when the scanned text is pure ASCII.
+    """
+    entries = sorted((w for w in words if isinstance(w, str) and _WORD_RE.fullmatch(w)),
+                     key=len, reverse=True)
+    if not entries:
+        return None
+    alternation = "|".join(re.escape(w) for w in entries)
+    flags = re.IGNORECASE | (re.ASCII if ascii_only else re.UNICODE)
+    return re.compile(r"(?<!\w)(?<!\w[-'])(?:" + alternation + r")(?![-']?\w)", flags)
+
+
+# Above this many entries, captions are matched per token with a set lookup
+# instead: `re` tries every alternative at each position, so a long
+# alternation costs far more than one hash lookup per word.
+_BAD_REGEX_MAX_WORDS = 100
+
+# id(bad set) -> (the set, its size, (ascii pattern, unicode pattern)).
+# Holding the set keeps its id from being reused; the GUI always assigns a
+# new set to BAD_WORDS rather than editing one in place.
+_BAD_RE_CACHE = {}
+
+
+def _bad_words_patterns(bad_set):
+    """Return (ascii_pattern, unicode_pattern) for `bad_set`, or None when
+    the set is large enough that per-token lookup is faster.
+
+    Looked up by set identity, so a caption pays no per-call hashing of the
+    whole list.
+    """
+    if len(bad_set) > _BAD_REGEX_MAX_WORDS:
+        return None
+    entry = _BAD_RE_CACHE.get(id(bad_set))
+    if entry is not None and entry[0] is bad_set and entry[1] == len(bad_set):
+        return entry[2]
+    words = frozenset(bad_set)
+    patterns = (_bad_words_regex(words, True), _bad_words_regex(words, False))
+    if len(_BAD_RE_CACHE) >= 8:
+        _BAD_RE_CACHE.clear()
+    _BAD_RE_CACHE[id(bad_set)] = (bad_set, len(bad_set), patterns)
+    return patterns
+
+
+@functools.lru_cache(maxsize=4096)
+def _mask_token(token: str, mode: str, mask_char: str, custom_text: str) -> str:
+    """Build the replacement for one matched token based on bleep settings.
+
+    Memoized: a session tends to repeat the same few words, and the result
+    depends only on the arguments.
+    """
+    if mode in ("fixed", "custom"):
+        return custom_text
+    if mode == "remove":
+        return ""
+
+    # For keep_first / keep_last / keep_first_last: preserve non-alnum chars
+    chars = list(token)
+    # indices of maskable characters (alphanumeric)
+    maskable = [i for i, c in enumerate(chars) if c.isalnum()]
+    if not maskable:
+        return token
+
+    def mask_indices(show_indices):
+        out = []
+        for i, c in enumerate(chars):
+            if not c.isalnum():
+                out.append(c)
+            elif i in show_indices:
+                out.append(c)
+            else:
+                out.append(mask_char)
+        return ''.join(out)
+
+    if mode == "keep_first":
+        show = {maskable[0]}
+        return mask_indices(show)
+    if mode == "keep_last":
+        show = {maskable[-1]}
+        return mask_indices(show)
+    if mode == "keep_first_last":
+        if len(maskable) == 1:
+            show = {maskable[0]}
+        else:
+            show = {maskable[0], maskable[-1]}
+        return mask_indices(show)
+
+    # fallback: fixed
+    return custom_text
+
 def bleep_text(text, bad_set=None):
     """Replace whole-word occurrences (case-insensitive) of bad words with 'bleep'.
 
@@ -137,71 +288,51 @@ def bleep_text(text, bad_set=None):
     if not bad_set or not text:
         return text
 
-    # Helper to build replacement based on settings
-    def _mask_token(token: str, mode: str, mask_char: str, custom_text: str) -> str:
-        if mode in ("fixed", "custom"):
-            return custom_text
-        if mode == "remove":
-            return ""
-
-        # For keep_first / keep_last / keep_first_last: preserve non-alnum chars
-        chars = list(token)
-        # indices of maskable characters (alphanumeric)
-        maskable = [i for i, c in enumerate(chars) if c.isalnum()]
-        if not maskable:
-            return token
-
-        def mask_indices(show_indices):
-            out = []
-            for i, c in enumerate(chars):
-                if not c.isalnum():
-                    out.append(c)
-                elif i in show_indices:
-                    out.append(c)
-                else:
-                    out.append(mask_char)
-            return ''.join(out)
-
-        if mode == "keep_first":
-            show = {maskable[0]}
-            return mask_indices(show)
-        if mode == "keep_last":
-            show = {maskable[-1]}
-            return mask_indices(show)
-        if mode == "keep_first_last":
-            if len(maskable) == 1:
-                show = {maskable[0]}
-            else:
-                show = {maskable[0], maskable[-1]}
-            return mask_indices(show)
-
-        # fallback: fixed
-        return custom_text
-
-    def _repl(m):
-        w = m.group(0)
-        if w.lower() not in bad_set:
-            return w
-        settings = globals().get('BLEEP_SETTINGS', None) or {}
-        mode = settings.get('mode', 'fixed')
-        mask_char = settings.get('mask_char', '*') or '*'
-        custom_text = settings.get('custom_text', '****') or '****'
-        try:
-            # ensure mask_char is single char
-            if not isinstance(mask_char, str) or mask_char == '':
-                mask_char = '*'
-            else:
-                mask_char = mask_char[0]
-        except Exception:
+    patterns = _bad_words_patterns(bad_set)
+    if patterns is not None:
+        # ASR output is nearly always ASCII; skip Unicode class lookups then
+        pattern = patterns[0] if text.isascii() else patterns[1]
+        if pattern is None:
+            return text
+
+    # Resolve replacement settings once per call rather than per match
+    settings = BLEEP_SETTINGS or {}
+    mode = settings.get('mode', 'fixed')
+    mask_char = settings.get('mask_char', '*') or '*'
+    custom_text = settings.get('custom_text', '****') or '****'
+    try:
+        # ensure mask_char is single char
+        if not isinstance(mask_char, str) or mask_char == '':
             mask_char = '*'
+        else:
+            mask_char = mask_char[0]
+    except Exception:
+        mask_char = '*'
 
-        try:
-            return _mask_token(w, mode, mask_char, custom_text)
-        except Exception:
-            # on any failure, fall back to simple fixed replacement
+    # Pick the replacement once; token-independent modes need no masking work
+    if mode in ("fixed", "custom"):
+        def _repl(m):
             return custom_text
+    elif mode == "remove":
+        def _repl(m):
+            return ""
+    else:
+        def _repl(m):
+            try:
+                return _mask_token(m.group(0), mode, mask_char, custom_text)
+            except Exception:
+                # on any failure, fall back to simple fixed replacement
+                return custom_text
+
+    if patterns is None:
+        # large list: tokenize and look each token up in the set
+        def _token_repl(m):
+            if m.group(0).lower() not in bad_set:
+                return m.group(0)
+            return _repl(m)
+        return _WORD_RE.sub(_token_repl, text)
 
-    return _WORD_RE.sub(_repl, text)
+    return pattern.sub(_repl, text)
 
 def callback(indata, frames, time, status):
     """Stream callback handles both numpy array input (InputStream) and raw bytes (RawInputStream).
@@ -214,7 +345,16 @@ def callback(indata, frames, time, status):
     if np is not None and isinstance(indata, np.ndarray):
         try:
             if indata.ndim > 1 and indata.shape[1] > 1:
-                mono = indata.mean(axis=1).astype('int16')
+                # integer downmix: no float64 temporary, no FP divide
+                channels = indata.shape[1]
+                if channels == 2:
+                    mixed = indata[:, 0].astype(np.int32) + indata[:, 1]
+                    mono = (mixed >> 1).astype(np.int16)
+                else:
+                    mono = (indata.sum(axis=1, dtype=np.int32) // channels).astype(np.int16)
+            elif indata.dtype == np.int16:
+                # already mono int16: a view is enough, tobytes() copies below
+                mono = indata.reshape(-1)
             else:
                 mono = indata.reshape(-1).astype('int16')
 
@@ -222,16 +362,22 @@ def callback(indata, frames, time, status):
             try:
                 mon = globals().get('AUDIO_MONITOR', None)
                 if mon is not None:
-                    mon(mono, SAMPLE_RATE)
+                    # the monitor may keep the array; never hand it a view of
+                    # PortAudio's buffer, which is reused after we return
+                    mon(mono if mono.base is None else mono.copy(), SAMPLE_RATE)
             except Exception:
                 pass
 
+            # Vosk's cffi binding only accepts `bytes` for AcceptWaveform
+            # (not bytearray/memoryview), so this is the one copy we keep.
             q.put(mono.tobytes())
             return
         except Exception:
             pass
 
-    # Fallback for RawInputStream or unexpected types: push raw bytes
+    # Fallback for RawInputStream or unexpected types: push raw bytes.
+    # bytes(x) returns `x` itself when it is already bytes (e.g. chunks
+    # forwarded by the noise_cancel wrapper), so that path does not copy.
     try:
         q.put(bytes(indata))
     except Exception:
@@ -245,33 +391,120 @@ def callback(indata, frames, time, status):
 # want to attach an external punctuation/casing service, implement a separate
 # adapter module and attach it to the engine at runtime.
 
+def _vocab_to_grammar(words) -> str:
+    """Serialize `words` as the JSON string array Vosk takes as a grammar.
+
+    Printable ASCII words only need quotes and backslashes escaped, which is
+    much cheaper than a full `json.dumps`; anything else goes through json.
+    The output is identical to `json.dumps(list(words))`.
+    """
+    parts = []
+    for w in words:
+        if w.isascii() and w.isprintable():
+            parts.append('"' + w.replace('\\', '\\\\').replace('"', '\\"') + '"')
+        else:
+            parts.append(json.dumps(w))
+    return '[' + ', '.join(parts) + ']'
+
+
+# Zero-padded two-digit strings for minutes/seconds in format_timestamp
+_TWO_DIGITS = tuple(f"{i:02d}" for i in range(60))
+
 def format_timestamp(seconds):
     # Format seconds (float) into SRT timestamp: HH:MM:SS,mmm
     total_seconds = int(seconds)
     ms = int((seconds - total_seconds) * 1000)
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    secs = total_seconds % 60
-    return f"{hours:02d}:{minutes:02d}:{secs:02d},{ms:03d}"
+    minutes, secs = divmod(total_seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{_TWO_DIGITS[minutes]}:{_TWO_DIGITS[secs]},{ms:03d}"
 
 def format_confidence(words):
     if not words:
         return 0.0
-    avg_conf = sum(w.get("conf", 0.0) for w in words) / len(words)
+    try:
+        # SetWords(True) results always carry "conf"; skip the .get default
+        total = sum([w["conf"] for w in words])
+    except (KeyError, TypeError):
+        total = sum(w.get("conf", 0.0) for w in words)
+    avg_conf = total / len(words)
     return round(avg_conf * 100, 1)
 
 
+class _UtteranceBuffer:
+    """Fixed-capacity byte ring holding the most recent audio of an utterance.
+
+    Appends cost O(chunk) no matter how long the utterance has run: once the
+    ring is full the oldest bytes are overwritten in place instead of
+    re-slicing (and copying) the whole buffer.
+    """
+
+    def __init__(self, capacity: int):
+        self._buf = bytearray(capacity)
+        self._pos = 0
+        self._full = False
+
+    def __len__(self):
+        return len(self._buf) if self._full else self._pos
+
+    def clear(self):
+        self._pos = 0
+        self._full = False
+
+    def extend(self, data):
+        cap = len(self._buf)
+        view = memoryview(data).cast('B')
+        n = len(view)
+        if n == 0 or cap == 0:
+            return
+        if n >= cap:
+            # chunk alone fills the ring: keep its tail
+            self._buf[:] = view[n - cap:]
+            self._pos = 0
+            self._full = True
+            return
+        end = self._pos + n
+        if end <= cap:
+            self._buf[self._pos:end] = view
+        else:
+            first = cap - self._pos
+            self._buf[self._pos:] = view[:first]
+            self._buf[:end - cap] = view[first:]
+        if end >= cap:
+            self._full = True
+        self._pos = end % cap
+
+    def getvalue(self) -> bytes:
+        """Return the buffered bytes in chronological order."""
+        if not self._full:
+            return bytes(self._buf[:self._pos])
+        return bytes(self._buf[self._pos:]) + bytes(self._buf[:self._pos])
+
+
 class CaptionEngine:
     """Caption engine that can be started/stopped and calls a callback with new caption text.
 
     callback signature: fn(text: str)
     """
 
-    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, demo: bool = False, source: str = "mic", cpu_threads: Optional[int] = None, voice_profiles_dir: Optional[str] = "voice_profiles", profile_match_threshold: float = 0.7, enable_profile_matching: bool = True, punctuator: Optional[str] = None):
+    # Relative change in mean utterance level below which the previous
+    # speaker label is reused instead of re-running profile matching.
+    # 0 disables the shortcut (every utterance is matched).
+    SPEAKER_ENERGY_TOLERANCE = 0.0
+    # Captions waiting for the punctuator beyond which they are emitted as-is.
+    PUNCT_BACKLOG_LIMIT = 4
+    # Seconds a model-backed punctuator waits for further captions to batch
+    # with the one in hand; VAICCS_PUNCT_BATCH_DELAY_MS overrides it.
+    PUNCT_BATCH_DELAY = 0.04
+
+    def __init__(self, model_path: str = DEFAULT_MODEL_PATH, demo: bool = False, source: str = "mic", cpu_threads: Optional[int] = None, voice_profiles_dir: Optional[str] = "voice_profiles", profile_match_threshold: float = 0.7, enable_profile_matching: bool = True, punctuator: Optional[str] = None, low_latency: bool = False):
         self.model_path = model_path
         self.demo = demo
         self.source = source
         self.cpu_threads = cpu_threads
+        # low_latency: open the stream with PortAudio's minimum block size
+        # instead of 500 ms blocks. Callbacks then arrive far more often, so
+        # the consumer must keep up with realtime.
+        self.low_latency = bool(low_latency)
         # voice profile matching
         self.enable_profile_matching = bool(enable_profile_matching)
         self.profile_match_threshold = float(profile_match_threshold)
@@ -283,6 +516,8 @@ class CaptionEngine:
             except Exception:
                 # profile manager not available or failed to load; disable matching
                 self._vpm = None
+        self._last_speaker: Optional[str] = None
+        self._last_energy = 0.0
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
         self._callback: Optional[Callable[[str], None]] = None
@@ -293,14 +528,124 @@ class CaptionEngine:
         self._rec_lock = threading.Lock()
         # optional runtime vocabulary (list of words) used to bias decoding
         self._current_vocab = None
+        self._grammar_cache = None
         # buffer for raw audio bytes corresponding to the current utterance
-        self._chunk_buffer = bytearray()
+        # (bounded to the most recent 30s)
+        self._chunk_buffer = _UtteranceBuffer(SAMPLE_RATE * 2 * UTTERANCE_BUFFER_SECONDS)
         # punctuator: optional path or model spec (e.g., 'hf:your-model-id')
         # Defer heavy punctuator initialization (may download HF models)
         # to `start()` so the GUI can show a loading dialog while it runs.
         self._punctuator_path = punctuator
         self._punctuator = None
         self._punctuator_init_error = None
+        # worker thread/queue that punctuates and emits captions
+        self._punct_q: Optional[queue.Queue] = None
+        self._punct_thread: Optional[threading.Thread] = None
+
+    def _match_speaker(self) -> Optional[str]:
+        """Match the buffered utterance against voice profiles.
+
+        Matching runs in memory (no temporary WAV). If
+        `SPEAKER_ENERGY_TOLERANCE` is set above 0 and the previous utterance
+        matched a speaker whose mean signal level has barely moved, the same
+        speaker is assumed and the embedding step is skipped. Loudness says
+        little about who is talking, so this is off by default.
+        """
+        speaker = None
+        try:
+            samples = np.frombuffer(self._chunk_buffer.getvalue(), dtype=np.int16)
+            tolerance = self.SPEAKER_ENERGY_TOLERANCE
+            energy = 0.0
+            if tolerance > 0 and samples.size:
+                energy = float(np.abs(samples.astype(np.int32)).mean())
+            last = self._last_energy
+            if (tolerance > 0 and self._last_speaker is not None and last > 0
+                    and abs(energy - last) / last < tolerance):
+                speaker = self._last_speaker
+            else:
+                try:
+                    res = self._vpm.match_profile_samples(samples, SAMPLE_RATE, top_k=1)
+                    if res:
+                        name, score = res[0]
+                        try:
+                            score = float(score)
+                        except Exception:
+                            score = 0.0
+                        if score >= float(self.profile_match_threshold):
+                            speaker = name
+                except Exception:
+                    # ignore matching errors
+                    speaker = None
+            self._last_energy = energy
+        except Exception:
+            speaker = None
+        self._last_speaker = speaker
+        return speaker
+
+    def _emit_caption(self, text: str, speaker: Optional[str]):
+        out = f"[{speaker}] {text}" if speaker else text
+        if self._callback:
+            self._callback(out)
+
+    def _punct_loop(self, punct_q: "queue.Queue"):
+        """Punctuate queued captions in order and emit them.
+
+        Captions that queued up while the model was busy, or that arrive
+        within `PUNCT_BATCH_DELAY` of the first, are punctuated together
+        through `punctuate_batch`. If captions still arrive faster
+        than the model can handle, the backlog is emitted unpunctuated until
+        it drains, so caption latency stays bounded.
+        """
+        delay = self.PUNCT_BATCH_DELAY
+        try:
+            delay = float(os.environ['VAICCS_PUNCT_BATCH_DELAY_MS']) / 1000.0
+        except (KeyError, ValueError):
+            pass
+        if getattr(self._punctuator, 'mode', 'rule') == 'rule':
+            # batching buys nothing without a model; do not hold captions
+            delay = 0.0
+        stopping = False
+        while not stopping:
+            item = punct_q.get()
+            if item is None:
+                break
+            batch = [item]
+            # phrases often arrive close together: give the next ones a
+            # short window to join this forward pass
+            deadline = time.monotonic() + delay
+            while len(batch) < self.PUNCT_BACKLOG_LIMIT:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = punct_q.get(timeout=remaining) if remaining > 0 else punct_q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            texts = [text for text, _ in batch]
+            final_texts = texts
+            if punct_q.qsize() < self.PUNCT_BACKLOG_LIMIT:
+                try:
+                    if len(texts) == 1:
+                        final_texts = [self._punctuator.punctuate(texts[0])]
+                    else:
+                        final_texts = self._punctuator.punctuate_batch(texts)
+                except Exception:
+                    final_texts = texts
+            for final_text, (_, speaker) in zip(final_texts, batch):
+                try:
+                    self._emit_caption(final_text, speaker)
+                except Exception:
+                    pass
+
+    def _stop_punct_worker(self):
+        punct_q, self._punct_q = self._punct_q, None
+        if punct_q is not None:
+            punct_q.put(None)
+        if self._punct_thread is not None:
+            self._punct_thread.join(timeout=2.0)
+            self._punct_thread = None
 
     def _init_punctuator(self):
         try:
@@ -349,37 +694,33 @@ class CaptionEngine:
                 tb = traceback.format_exc()
             except Exception:
                 tb = str(e)
-            # Try writing the traceback to several accessible locations so
-            # users running a frozen exe can find the cause more easily.
+            # Write the traceback to the first accessible location so users
+            # running a frozen exe can find the cause more easily: the
+            # launched executable's directory, the current working directory,
+            # then next to this module (may be inside bundle; best-effort).
             tried_paths = []
+            candidates = []
             try:
-                # 1) directory of the launched executable (works for exe builds)
-                exe_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
-                p1 = os.path.join(exe_dir, "vosk_import_error.log")
-                with open(p1, "w", encoding="utf-8") as lf:
-                    lf.write(tb)
-                tried_paths.append(p1)
+                candidates.append(os.path.dirname(os.path.abspath(sys.argv[0])))
             except Exception:
                 pass
             try:
-                # 2) current working directory
-                p2 = os.path.join(os.getcwd(), "vosk_import_error.log")
-                if p2 not in tried_paths:
-                    with open(p2, "w", encoding="utf-8") as lf:
-                        lf.write(tb)
-                    tried_paths.append(p2)
+                candidates.append(os.getcwd())
             except Exception:
                 pass
             try:
-                # 3) fallback: next to this module (may be inside bundle; best-effort)
-                here = os.path.dirname(__file__)
-                p3 = os.path.join(here, "vosk_import_error.log")
-                if p3 not in tried_paths:
-                    with open(p3, "w", encoding="utf-8") as lf:
-                        lf.write(tb)
-                    tried_paths.append(p3)
+                candidates.append(os.path.dirname(__file__))
             except Exception:
                 pass
+            for d in dict.fromkeys(candidates):
+                p = os.path.join(d, "vosk_import_error.log")
+                try:
+                    with open(p, "w", encoding="utf-8") as lf:
+                        lf.write(tb)
+                    tried_paths.append(p)
+                    break
+                except Exception:
+                    continue
             # Also emit to stderr so console users see it
             try:
                 sys.stderr.write("VOSK import failed; traceback written to: " + ",".join(tried_paths) + "\n")
@@ -435,8 +776,7 @@ class CaptionEngine:
             # If a runtime vocabulary was configured, pass it as grammar to KaldiRecognizer
             try:
                 if self._current_vocab:
-                    import json as _json
-                    grammar = _json.dumps(self._current_vocab)
+                    grammar = self._grammar()
                     self._recognizer = KaldiRecognizer(self._model, SAMPLE_RATE, grammar)
                 else:
                     self._recognizer = KaldiRecognizer(self._model, SAMPLE_RATE)
@@ -459,15 +799,16 @@ class CaptionEngine:
         thread-safe manner. If called before recognizer/model is initialized,
         the vocabulary will be used when the recognizer is later created.
         """
-        try:
-            import json as _json
-        except Exception:
-            _json = None
         # normalize words to simple strings
         if not words:
-            self._current_vocab = None
+            new_vocab = None
         else:
-            self._current_vocab = [str(w) for w in words]
+            new_vocab = [str(w) for w in words]
+        # an identical vocabulary needs no recognizer rebuild (which would
+        # also throw away in-progress decoding state)
+        if new_vocab == self._current_vocab and getattr(self, '_recognizer', None) is not None:
+            return
+        self._current_vocab = new_vocab
 
         # If recognizer is active, recreate it with the grammar under lock.
         with self._rec_lock:
@@ -480,8 +821,8 @@ class CaptionEngine:
                 except Exception:
                     KaldiRecognizer = None
 
-                if self._current_vocab and _json is not None and KaldiRecognizer is not None:
-                    grammar = _json.dumps(self._current_vocab)
+                if self._current_vocab and KaldiRecognizer is not None:
+                    grammar = self._grammar()
                     try:
                         self._recognizer = KaldiRecognizer(self._model, SAMPLE_RATE, grammar)
                     except Exception:
@@ -498,6 +839,13 @@ class CaptionEngine:
                 # leave recognizer as-is on failure
                 pass
 
+    def _grammar(self) -> str:
+        """Return the Vosk grammar JSON for the current vocabulary (cached)."""
+        key = tuple(self._current_vocab or ())
+        if self._grammar_cache is None or self._grammar_cache[0] != key:
+            self._grammar_cache = (key, _vocab_to_grammar(key))
+        return self._grammar_cache[1]
+
     def get_current_vocab(self) -> List[str]:
         return list(self._current_vocab) if self._current_vocab else []
 
@@ -506,6 +854,8 @@ class CaptionEngine:
             return
         _ensure_bad_words()
         self._callback = callback
+        self._last_speaker = None
+        self._last_energy = 0.0
         self._stop_event.clear()
         # Initialize punctuator here (runs in engine.start thread when called
         # from GUI's _start_engine_async) so downloads happen off the main thread
@@ -513,6 +863,11 @@ class CaptionEngine:
             self._init_punctuator()
         except Exception:
             pass
+        self._stop_punct_worker()
+        if self._punctuator is not None:
+            self._punct_q = queue.Queue()
+            self._punct_thread = threading.Thread(target=self._punct_loop, args=(self._punct_q,), daemon=True)
+            self._punct_thread.start()
         self._init_recognizer()
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
@@ -521,6 +876,8 @@ class CaptionEngine:
         self._stop_event.set()
         if self._thread:
             self._thread.join(timeout=2.0)
+        # let already-recognized captions finish punctuating, then stop the worker
+        self._stop_punct_worker()
         # Clean up any temporary extracted model directory created when a
         # model archive was supplied.
         try:
@@ -544,6 +901,10 @@ class CaptionEngine:
             pass
         # build stream kwargs
         stream_kwargs = dict(samplerate=SAMPLE_RATE, blocksize=8000, dtype='int16', channels=1, callback=callback)
+        if self.low_latency:
+            # let PortAudio pick the smallest block size the host supports
+            stream_kwargs['blocksize'] = 0
+            stream_kwargs['latency'] = 'low'
         use_raw = False
         if np is None:
             use_raw = True
@@ -557,12 +918,12 @@ class CaptionEngine:
 
         try:
             if use_raw:
-                stream = sd.RawInputStream(samplerate=SAMPLE_RATE, blocksize=8000, dtype='int16', channels=stream_kwargs.get('channels', 1), callback=callback, **({'extra_settings': stream_kwargs['extra_settings']} if 'extra_settings' in stream_kwargs else {}))
+                stream = sd.RawInputStream(**stream_kwargs)
             else:
                 stream = sd.InputStream(**stream_kwargs)
 
             with stream:
-                start_time = datetime.datetime.now()
+                start_time = time.monotonic()
                 caption_index = 1
                 while not self._stop_event.is_set():
                     try:
@@ -575,87 +936,40 @@ class CaptionEngine:
 
                     if local_rec is not None:
                         try:
-                            # append chunk to the current utterance buffer (int16 bytes)
+                            # append chunk to the current utterance buffer (int16 bytes);
+                            # the ring keeps only the most recent 30s
                             try:
                                 self._chunk_buffer.extend(data)
                             except Exception:
                                 # if buffer extend fails, reset buffer
-                                self._chunk_buffer = bytearray(data)
-
-                            # keep buffer bounded (e.g., max 30s)
-                            try:
-                                max_bytes = SAMPLE_RATE * 2 * 30
-                                if len(self._chunk_buffer) > max_bytes:
-                                    self._chunk_buffer = self._chunk_buffer[-max_bytes:]
-                            except Exception:
-                                pass
+                                self._chunk_buffer.clear()
 
                             if local_rec.AcceptWaveform(data):
-                                result = json.loads(local_rec.Result())
+                                result = _json_loads(local_rec.Result())
                                 words = result.get("result", [])
                                 text = result.get("text", "")
                                 if words and text.strip():
-                                    bleeped = bleep_text(text)
+                                    # nothing restricted is the common default; skip the call
+                                    bleeped = bleep_text(text) if BAD_WORDS else text
 
-                                    speaker = None
                                     # try to match speaker using buffered audio if profile manager is available
-                                    if self._vpm is not None:
-                                        tmpf = None
-                                        try:
-                                            tmpf = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-                                            tmpf.close()
-                                            with wave.open(tmpf.name, 'wb') as wf:
-                                                wf.setnchannels(1)
-                                                wf.setsampwidth(2)
-                                                wf.setframerate(SAMPLE_RATE)
-                                                wf.writeframes(bytes(self._chunk_buffer))
-                                            try:
-                                                res = self._vpm.match_profile(tmpf.name, top_k=1)
-                                                if res:
-                                                    name, score = res[0]
-                                                    try:
-                                                        score = float(score)
-                                                    except Exception:
-                                                        score = 0.0
-                                                    if score >= float(self.profile_match_threshold):
-                                                        speaker = name
-                                            except Exception:
-                                                # ignore matching errors
-                                                speaker = None
-                                        except Exception:
-                                            speaker = None
-                                        finally:
-                                            try:
-                                                if tmpf is not None:
-                                                    os.unlink(tmpf.name)
-                                            except Exception:
-                                                pass
-
-                                    # Post-process ASR text with our punctuator (if available).
-                                    try:
-                                        if getattr(self, '_punctuator', None) is not None:
-                                            final_text = self._punctuator.punctuate(bleeped)
-                                        else:
-                                            final_text = bleeped
-                                    except Exception:
-                                        final_text = bleeped
-
-                                    if speaker:
-                                        out = f"[{speaker}] {final_text}"
-                                    else:
-                                        out = final_text
+                                    speaker = self._match_speaker() if self._vpm is not None else None
 
                                     # reset buffer for next utterance
-                                    self._chunk_buffer = bytearray()
+                                    self._chunk_buffer.clear()
 
-                                    if self._callback:
-                                        self._callback(out)
+                                    # Post-process ASR text with our punctuator (if available)
+                                    # on its worker thread so slow models never stall decoding.
+                                    punct_q = self._punct_q
+                                    if punct_q is not None:
+                                        punct_q.put((bleeped, speaker))
+                                    else:
+                                        self._emit_caption(bleeped, speaker)
                                     caption_index += 1
                         except Exception:
                             continue
                     else:
-                        now = datetime.datetime.now()
-                        elapsed = (now - start_time).total_seconds()
+                        elapsed = time.monotonic() - start_time
                         out = f"[DEMO] audio captured @ {format_timestamp(elapsed)}"
                         if self._callback:
                             self._callback(out)
@@ -673,9 +987,10 @@ if __name__ == "__main__":
     parser.add_argument("--demo", action="store_true", help="Run in demo mode without a Vosk model")
     parser.add_argument("--source", "-s", choices=("mic", "system"), default="mic",
                         help="Audio source: 'mic' for default microphone, 'system' for internal computer sound (loopback, Windows WASAPI)")
+    parser.add_argument("--low-latency", action="store_true", help="Use the smallest audio block size the device supports instead of 500 ms blocks")
     args = parser.parse_args()
 
-    engine = CaptionEngine(model_path=args.model, demo=args.demo, source=args.source)
+    engine = CaptionEngine(model_path=args.model, demo=args.demo, source=args.source, low_latency=args.low_latency)
 
     try:
         print("🎙️ Streaming captions... Press Ctrl+C to stop.")
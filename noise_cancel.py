@@ -17,6 +17,12 @@ try:
     import numpy as np
 except Exception:
     np = None
+# Numba is optional; when present the fallback noise gate runs as one
+# compiled pass instead of several numpy temporaries per audio callback.
+try:
+    from numba import njit
+except Exception:
+    njit = None
 
 # Attempt to import Hance SDK at module level so we can expose clearer
 # error messages and share a single reference. The actual SDK name and
@@ -32,6 +38,74 @@ _installed = False
 _lock = threading.Lock()
 
 
+def _store(result, out):
+    """Copy `result` into `out` when given and shape-compatible; return the
+    array that holds the processed samples."""
+    if out is None or result is out:
+        return result
+    try:
+        if result.shape == out.shape:
+            np.copyto(out, result, casting='unsafe')
+            return out
+    except Exception:
+        pass
+    return result
+
+
+def _adapt_bytes(res):
+    return np.frombuffer(bytes(res), dtype=np.int16)
+
+
+def _adapt_ndarray(res):
+    return res.astype(np.int16)
+
+
+def _adapt_coerce(res):
+    return np.asarray(res, dtype=np.int16)
+
+
+def _pick_adapter(res):
+    """Choose how to turn an SDK result of this type into an int16 array."""
+    if isinstance(res, (bytes, bytearray)):
+        return _adapt_bytes
+    if hasattr(res, 'dtype'):
+        return _adapt_ndarray
+    return _adapt_coerce
+
+
+_gate_kernel = None
+if njit is not None and np is not None:
+    try:
+        @njit(cache=True, fastmath=True, boundscheck=False)
+        def _gate_kernel(arr, out, last_noise):
+            """Fused RMS noise gate: writes gated int16 samples of `arr` into
+            `out` and returns the updated noise estimate. `arr` must be
+            non-empty."""
+            n = arr.shape[0]
+            scale = 1.0 / 32768.0
+            sumsq = 0.0
+            for i in range(n):
+                f = arr[i] * scale
+                sumsq += f * f
+            rms = np.sqrt(sumsq / n + 1e-12)
+            last_noise = 0.995 * last_noise + 0.005 * rms
+            thresh = last_noise * 1.5
+            thresh = 1e-4 if thresh < 1e-4 else thresh
+            # 0.25 below the threshold, 1.0 otherwise, without a branch
+            factor = 0.25 + 0.75 * np.float64(rms >= thresh)
+            gain = factor * scale * 32767.0
+            for i in range(n):
+                v = arr[i] * gain
+                if v > 32767.0:
+                    v = 32767.0
+                elif v < -32768.0:
+                    v = -32768.0
+                out[i] = np.int16(v)
+            return last_noise
+    except Exception:
+        _gate_kernel = None
+
+
 class HanceProcessor:
     def __init__(self, model_path: Optional[str] = None):
         self.model_path = model_path
@@ -39,6 +113,10 @@ class HanceProcessor:
         self._model = None
         self._hance_proc = None
         self._last_noise = 1e-6
+        # float32 scratch for the numpy noise gate, grown on demand
+        self._f_buf = None
+        # int16 output buffer reused by process_bytes, grown on demand
+        self._bytes_out = None
         # Try to initialize the Hance SDK if available. We attempt several
         # common API shapes so this will work for different SDK versions.
         if hance_sdk is not None:
@@ -71,52 +149,84 @@ class HanceProcessor:
                 self._hance_proc = None
                 self._has_hance = False
 
-    def process_int16_array(self, arr):
+        # Resolve the SDK's processing method(s) once instead of probing
+        # attribute names on every audio buffer.
+        self._hance_calls = ()
+        self._hance_adapters = {}
+        if self._has_hance and self._hance_proc is not None:
+            calls = []
+            for name in ('process', 'apply', 'denoise', 'infer', 'run'):
+                try:
+                    fn = getattr(self._hance_proc, name, None)
+                except Exception:
+                    fn = None
+                if callable(fn):
+                    calls.append(fn)
+            self._hance_calls = tuple(calls)
+
+        # Compile the gate kernel now (or load it from numba's cache) so the
+        # first audio callback is not stalled by JIT compilation.
+        if _gate_kernel is not None and not self._has_hance:
+            try:
+                _gate_kernel(np.zeros(1, dtype=np.int16), np.empty(1, dtype=np.int16), 1e-6)
+            except Exception:
+                pass
+
+    def process_int16_array(self, arr, out=None):
         """Process a numpy int16 array and return a new int16 array.
 
         If a real Hance model is available, call into it. Otherwise apply
         a simple noise-gating algorithm.
+
+        If `out` (an int16 array shaped like `arr`) is given, the result is
+        written into it and `out` is returned, so callers can reuse a buffer.
         """
         if arr is None:
             return arr
-        # If Hance SDK available and processor loaded, attempt to call it
-        if self._has_hance and self._hance_proc is not None:
+        # If Hance SDK available and processor loaded, call the methods
+        # resolved in __init__ (in preference order)
+        for fn in self._hance_calls:
             try:
-                # Try several common method names (process, apply, denoise, infer)
-                for name in ('process', 'apply', 'denoise', 'infer', 'run'):
-                    fn = getattr(self._hance_proc, name, None)
-                    if callable(fn):
-                        try:
-                            out = fn(arr)
-                            # If returns bytes, convert to numpy
-                            if isinstance(out, (bytes, bytearray)) and np is not None:
-                                out_arr = np.frombuffer(bytes(out), dtype=np.int16)
-                                return out_arr
-                            # If returns numpy-like, convert to int16
-                            if np is not None and hasattr(out, 'dtype'):
-                                return out.astype(np.int16)
-                            # otherwise, if it returned list-like, try to coerce
-                            try:
-                                return np.asarray(out, dtype=np.int16)
-                            except Exception:
-                                return arr
-                        except Exception:
-                            # try next method name
-                            continue
+                res = fn(arr)
             except Exception:
-                # fall through to fallback
-                pass
+                # try next method
+                continue
+            try:
+                adapt = self._hance_adapters.get(type(res))
+                if adapt is None:
+                    adapt = self._hance_adapters[type(res)] = _pick_adapter(res)
+                return _store(adapt(res), out)
+            except Exception:
+                return arr
 
         # Fallback: simple RMS-based noise gate
         if np is None:
             # no numpy -> return unchanged
             return arr
 
+        if _gate_kernel is not None:
+            try:
+                if arr.dtype == np.int16 and arr.ndim == 1 and arr.size:
+                    if out is None or out.shape != arr.shape or out.dtype != np.int16:
+                        out = np.empty_like(arr)
+                    self._last_noise = float(_gate_kernel(arr, out, self._last_noise))
+                    return out
+            except Exception:
+                # fall back to the numpy implementation below
+                pass
+
         try:
+            n = arr.size
+            if not n:
+                return arr
+            if self._f_buf is None or self._f_buf.shape[0] < n:
+                self._f_buf = np.empty(n, dtype=np.float32)
+            f = self._f_buf[:n].reshape(arr.shape)
             # compute short-window RMS
-            # use waveform as float in -1..1
-            f = arr.astype('float32') / 32768.0
-            rms = float(np.sqrt(np.mean(f * f) + 1e-12))
+            # use waveform as float in -1..1, written into the scratch buffer
+            np.multiply(arr, 1.0 / 32768.0, out=f, dtype=np.float32, casting='unsafe')
+            flat = f.reshape(-1)
+            rms = float(np.sqrt(np.dot(flat, flat) / n + 1e-12))
             # update noise estimate (slow-moving average)
             alpha = 0.995
             self._last_noise = alpha * self._last_noise + (1.0 - alpha) * rms
@@ -128,10 +238,13 @@ class HanceProcessor:
             else:
                 factor = 1.0
 
-            out = (f * factor)
-            # re-scale to int16
-            out_i16 = np.clip(out * 32767.0, -32768, 32767).astype(np.int16)
-            return out_i16
+            # apply the gain and re-scale to int16 in place, then narrow once
+            np.multiply(f, factor * 32767.0, out=f, casting='unsafe')
+            np.clip(f, -32768, 32767, out=f)
+            if out is None or out.shape != arr.shape or out.dtype != np.int16:
+                out = np.empty(arr.shape, dtype=np.int16)
+            np.copyto(out, f, casting='unsafe')
+            return out
         except Exception:
             return arr
 
@@ -143,8 +256,12 @@ class HanceProcessor:
             # cannot process; return original
             return data
         try:
+            # zero-copy view of the input; the result goes into a reused buffer
             arr = np.frombuffer(data, dtype=np.int16)
-            out = self.process_int16_array(arr)
+            n = arr.shape[0]
+            if self._bytes_out is None or self._bytes_out.shape[0] < n:
+                self._bytes_out = np.empty(n, dtype=np.int16)
+            out = self.process_int16_array(arr, out=self._bytes_out[:n])
             # if result is numpy array
             if np is not None and hasattr(out, 'tobytes'):
                 return out.tobytes()
@@ -157,35 +274,112 @@ class HanceProcessor:
             return data
 
 
+class _LayoutMismatch(ValueError):
+    """A specialised callback handler was handed a block layout it was not built for."""
+
+
 def _make_wrapper(proc: Optional[HanceProcessor], original_cb: Callable):
     """Return a callback wrapper that applies `proc` (if provided) then
     calls `original_cb` with the processed data (matching signature of
     sounddevice callbacks).
+
+    The input layout (raw bytes vs ndarray, dtype, channel count) is fixed
+    for a stream, so the first block picks a specialised handler and later
+    blocks go straight to it. A handler raises `_LayoutMismatch` when handed
+    a layout it was not built for (e.g. the stream was reopened with another
+    channel count), and a new one is picked for that block. Any other error
+    comes from the processor and falls back to `original_cb`.
     """
 
+    # Scratch buffers reused across callbacks (re-sized only when the block
+    # size changes) so the audio thread does not allocate in steady state.
+    scratch = {'frames': -1, 'mono': None, 'out': None, 'acc': None}
+
+    def _buffers(n):
+        if scratch['frames'] != n:
+            scratch['mono'] = np.empty(n, dtype=np.int16)
+            scratch['out'] = np.empty(n, dtype=np.int16)
+            scratch['acc'] = np.empty(n, dtype=np.int32)
+            scratch['frames'] = n
+        return scratch['mono'], scratch['out'], scratch['acc']
+
+    def _mono_i16(indata):
+        if (not isinstance(indata, np.ndarray) or indata.dtype != np.int16
+                or indata.ndim == 0 or indata.size != indata.shape[0]):
+            raise _LayoutMismatch('not mono int16')
+        _, out_buf, _ = _buffers(indata.shape[0])
+        # read-only use; a view of the input is enough
+        return proc.process_int16_array(indata.reshape(-1), out=out_buf)
+
+    def _stereo_i16(indata):
+        if (not isinstance(indata, np.ndarray) or indata.dtype != np.int16
+                or indata.ndim != 2 or indata.shape[1] != 2):
+            raise _LayoutMismatch('not stereo int16')
+        mono_buf, out_buf, acc = _buffers(indata.shape[0])
+        # integer downmix: no float64 temporary, no divide for stereo
+        np.add(indata[:, 0], indata[:, 1], dtype=np.int32, out=acc)
+        np.right_shift(acc, 1, out=acc)
+        np.copyto(mono_buf, acc, casting='unsafe')
+        return proc.process_int16_array(mono_buf, out=out_buf)
+
+    def _multi_i16(indata):
+        if (not isinstance(indata, np.ndarray) or indata.dtype != np.int16
+                or indata.ndim != 2 or indata.shape[1] <= 2):
+            raise _LayoutMismatch('not multi-channel int16')
+        mono_buf, out_buf, acc = _buffers(indata.shape[0])
+        np.sum(indata, axis=1, dtype=np.int32, out=acc)
+        np.floor_divide(acc, indata.shape[1], out=acc)
+        np.copyto(mono_buf, acc, casting='unsafe')
+        return proc.process_int16_array(mono_buf, out=out_buf)
+
+    def _other_dtype(indata):
+        if not isinstance(indata, np.ndarray) or indata.dtype == np.int16 or indata.ndim == 0:
+            raise _LayoutMismatch('int16 has its own handlers')
+        mono_buf, out_buf, _ = _buffers(indata.shape[0])
+        if indata.ndim > 1 and indata.shape[1] > 1:
+            np.copyto(mono_buf, indata.mean(axis=1), casting='unsafe')
+        else:
+            np.copyto(mono_buf, indata.reshape(-1), casting='unsafe')
+        return proc.process_int16_array(mono_buf, out=out_buf)
+
+    def _pick(indata):
+        if proc is None or np is None or not isinstance(indata, np.ndarray):
+            return None
+        if indata.dtype != np.int16:
+            return _other_dtype
+        if indata.ndim == 1 or indata.shape[1] == 1:
+            return _mono_i16
+        return _stereo_i16 if indata.shape[1] == 2 else _multi_i16
+
+    current = [None]
+
+    def _process(indata):
+        """Return the processed int16 block, or None when `indata` is not an
+        ndarray this wrapper handles (raw bytes, or no processor)."""
+        handler = current[0]
+        if handler is not None:
+            try:
+                return handler(indata)
+            except _LayoutMismatch:
+                pass
+        # first block, or the layout changed
+        handler = current[0] = _pick(indata)
+        return handler(indata) if handler is not None else None
+
     def wrapper(indata, frames, time_info, status):
-        # Try to behave like main.callback: accept ndarray or raw bytes
         try:
-            if np is not None and isinstance(indata, np.ndarray):
-                try:
-                    if proc is not None:
-                        # downmix multi-channel to mono then process
-                        if indata.ndim > 1 and indata.shape[1] > 1:
-                            mono = indata.mean(axis=1).astype('int16')
-                        else:
-                            mono = indata.reshape(-1).astype('int16')
-                        processed = proc.process_int16_array(mono)
-                        original_cb(processed.tobytes(), frames, time_info, status)
-                        return
-                    else:
-                        original_cb(indata, frames, time_info, status)
-                        return
-                except Exception:
-                    # on error, fallback to original
-                    original_cb(indata, frames, time_info, status)
-                    return
+            try:
+                processed = _process(indata)
+            except Exception:
+                # on error, fallback to original
+                original_cb(indata, frames, time_info, status)
+                return
+            if processed is not None:
+                # main.q/Vosk need bytes, so this is the one copy made
+                original_cb(processed.tobytes(), frames, time_info, status)
+                return
 
-            # Fallback for raw bytes
+            # Raw bytes (or no processor)
             try:
                 if proc is not None:
                     processed = proc.process_bytes(bytes(indata))
@@ -1,8 +1,61 @@
 import requests
+import atexit
 import os
 import json
+import time
 from typing import Dict, List
 
+from resources import get_user_data_dir
+
+# ijson is optional: when present the tree listing is decoded as a stream
+# and only entries under Models/ are kept.
+try:
+    import ijson
+except Exception:
+    ijson = None
+
+# One pooled session so repeated lookups reuse the TLS connection; requests
+# already asks for gzip-compressed responses.
+_SESSION = requests.Session()
+atexit.register(_SESSION.close)
+
+# orjson (optional) for the indented listing printed by __main__.
+try:
+    import orjson
+
+    def _dumps_pretty(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+except Exception:
+    def _dumps_pretty(obj) -> str:
+        return json.dumps(obj, indent=2)
+
+def _tree_cache_path() -> str:
+    # Last tree listing and its ETag, reused through conditional requests;
+    # kept with the other per-user files (APPDATA on Windows)
+    return os.path.join(get_user_data_dir(), 'hance_tree.json')
+
+
+def _load_tree_cache() -> Dict:
+    try:
+        with open(_tree_cache_path(), 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        if isinstance(cached, dict) and isinstance(cached.get('items'), list):
+            return cached
+    except Exception:
+        pass
+    return {}
+
+
+def _save_tree_cache(cached: Dict) -> None:
+    try:
+        path = _tree_cache_path()
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(cached, f)
+        os.replace(tmp, path)
+    except Exception:
+        pass
+
 
 def _human_size(bytesize: int) -> str:
     if bytesize is None:
@@ -36,10 +89,37 @@ def parse_hance_models():
     gh_token = os.environ.get('GITHUB_TOKEN') or os.environ.get('GH_TOKEN')
     if gh_token:
         headers['Authorization'] = f'token {gh_token}'
+    cached = _load_tree_cache()
+    if cached.get('etag'):
+        # Unchanged trees come back as an empty 304, which GitHub does not
+        # count against the rate limit.
+        headers['If-None-Match'] = cached['etag']
+        # Out of quota until the reset time: answer from the cache instead
+        # of waiting on a request that will be refused.
+        try:
+            if int(cached.get('ratelimit_remaining', 1)) <= 0 and time.time() < float(cached.get('ratelimit_reset', 0)):
+                return {'Hance Models': cached['items']}
+        except Exception:
+            pass
+    etag = None
     try:
-        r = requests.get(api_tree, timeout=20, headers=headers)
-        r.raise_for_status()
-        data = r.json()
+        with _SESSION.get(api_tree, timeout=20, headers=headers, stream=ijson is not None) as r:
+            if r.status_code == 304 and cached.get('etag'):
+                return {'Hance Models': cached['items']}
+            if r.status_code in (403, 429) and cached.get('items'):
+                return {'Hance Models': cached['items']}
+            r.raise_for_status()
+            etag = r.headers.get('ETag')
+            ratelimit = (r.headers.get('X-RateLimit-Remaining'), r.headers.get('X-RateLimit-Reset'))
+            if ijson is not None:
+                # The recursive tree can be several MB; filter entries while
+                # parsing instead of building dicts for the whole repository.
+                r.raw.decode_content = True
+                data = {'tree': [entry for entry in ijson.items(r.raw, 'tree.item')
+                                 if entry.get('type') == 'blob'
+                                 and entry.get('path', '').lower().startswith('models/')]}
+            else:
+                data = r.json()
     except Exception:
         # Fallback to contents API (non-recursive) with manual recursion
         data = None
@@ -49,18 +129,18 @@ def parse_hance_models():
     if isinstance(data, dict) and data.get('tree'):
         # Parse git tree objects
         for entry in data.get('tree', []):
-            if entry.get('type') != 'blob':
+            entry_get = entry.get
+            if entry_get('type') != 'blob':
                 continue
-            path = entry.get('path', '')
-            if not path.lower().startswith('models/'):
+            path = entry_get('path', '')
+            # the extension is matched on the full path: same suffix as the name
+            lower = path.lower()
+            if not lower.startswith('models/') or not lower.endswith(allowed_exts):
                 continue
             name = os.path.basename(path)
-            lower = name.lower()
-            if not any(lower.endswith(ext) for ext in allowed_exts):
-                continue
             # Build raw download URL
             url = f'https://raw.githubusercontent.com/{owner}/{repo}/{branch}/{path}'
-            size = _human_size(entry.get('size'))
+            size = _human_size(entry_get('size'))
             items.append({'name': name, 'url': url, 'size': size})
     elif isinstance(data, list):
         # fallback to contents API (non-recursive)
@@ -73,18 +153,22 @@ def parse_hance_models():
                 continue
             lower = name.lower()
             # Accept only plausible model artifacts; otherwise skip (e.g., README.md)
-            if not any(lower.endswith(ext) for ext in allowed_exts):
+            if not lower.endswith(allowed_exts):
                 continue
             url = item.get('download_url') or item.get('html_url')
             size = _human_size(item.get('size'))
             items.append({'name': name, 'url': url, 'size': size})
 
+    if etag and isinstance(data, dict):
+        _save_tree_cache({'etag': etag, 'items': items,
+                          'ratelimit_remaining': ratelimit[0], 'ratelimit_reset': ratelimit[1]})
+
     # Single category 'Hance Models' to match the user's request of a simple list
     return {'Hance Models': items}
 
 
 if __name__ == '__main__':
     try:
-        print(json.dumps(parse_hance_models(), indent=2))
+        print(_dumps_pretty(parse_hance_models()))
     except Exception as e:
         print('Error:', e)
@@ -1,85 +1,125 @@
 import requests
+import atexit
 from bs4 import BeautifulSoup
 import re
 import os
+import sys
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urljoin
 import json
 
+# Size tokens such as "40M", "1.8G" or "2.3 GB". Google RE2 (optional)
+# matches in linear time without backtracking; stdlib `re` otherwise.
+_SIZE_PATTERN = r'(?i)(\d+(?:\.\d+)?\s*(?:GB|GiB|MB|MiB|KB|KiB|M|G))'
+# Archive links: any of .zip/.tgz/.tar(.gz|.bz2|.xz) inside the href. '.tar'
+# alone already covers the compressed tar suffixes for a containment test.
+_ARCHIVE_PATTERN = r'(?i)\.(?:zip|tgz|tar)'
+try:
+    import re2
+    _SIZE_RE = re2.compile(_SIZE_PATTERN)
+    _ARCHIVE_RE = re2.compile(_ARCHIVE_PATTERN)
+except Exception:
+    _SIZE_RE = re.compile(_SIZE_PATTERN)
+    _ARCHIVE_RE = re.compile(_ARCHIVE_PATTERN)
+
+# Pretty JSON for the command-line output; orjson (optional) is much faster
+# at indented output than the stdlib encoder.
+try:
+    import orjson
+
+    def _dumps_pretty(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+except Exception:
+    def _dumps_pretty(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+# Shared keep-alive session: a refresh from the GUI skips the TLS handshake.
+_SESSION = requests.Session()
+atexit.register(_SESSION.close)
+
+# Language codes that may appear as a dash-delimited token in model names.
+_LANG_CODES = {
+    'en-us': 'English', 'en-in': 'English (India)', 'en': 'English',
+    'cn': 'Chinese', 'zh-cn': 'Chinese', 'zh': 'Chinese',
+    'ru': 'Russian', 'fr': 'French', 'de': 'German', 'es': 'Spanish',
+    'pt': 'Portuguese', 'gr': 'Greek', 'tr': 'Turkish', 'vn': 'Vietnamese',
+    'it': 'Italian', 'nl': 'Dutch', 'ca': 'Catalan', 'ar-tn': 'Arabic (Tunisian)', 'ar': 'Arabic',
+    'fa': 'Farsi', 'ph': 'Filipino', 'uk': 'Ukrainian', 'kz': 'Kazakh', 'sv': 'Swedish',
+    'eo': 'Esperanto', 'hi': 'Hindi', 'cs': 'Czech', 'pl': 'Polish', 'uz': 'Uzbek',
+    'br': 'Breton', 'gu': 'Gujarati', 'tg': 'Tajik', 'te': 'Telugu', 'ky': 'Kyrgyz'
+}
+_CODES_BY_LENGTH = sorted(_LANG_CODES, key=lambda x: -len(x))
+
+# With pyahocorasick (optional) all codes are matched in a single scan of
+# the name. Values are (-len, table order, language) so the smallest hit is
+# the longest code, ties going to the earlier table entry.
+try:
+    import ahocorasick
+    _LANG_AUTOMATON = ahocorasick.Automaton()
+    for _order, _code in enumerate(_CODES_BY_LENGTH):
+        _hit = (-len(_code), _order, _LANG_CODES[_code])
+        _LANG_AUTOMATON.add_word(f'-{_code}-', _hit)
+        _LANG_AUTOMATON.add_word(f'-{_code}_', _hit)
+    _LANG_AUTOMATON.make_automaton()
+except Exception:
+    _LANG_AUTOMATON = None
+
 
 def parse_vosk_models():
     url = 'https://alphacephei.com/vosk/models'
-    r = requests.get(url, timeout=20)
+    r = _SESSION.get(url, timeout=20)
     r.raise_for_status()
     text = r.text
 
-    soup = BeautifulSoup(text, 'html.parser')
-    archive_exts = ('.zip', '.tar.gz', '.tgz', '.tar', '.tar.bz2', '.tar.xz')
-    size_re = re.compile(r'(\d+(?:\.\d+)?\s*(?:GB|GiB|MB|MiB|KB|KiB|M|G))', re.IGNORECASE)
+    try:
+        # libxml2-backed parser; several times faster on this page
+        soup = BeautifulSoup(text, 'lxml')
+    except Exception:
+        # lxml not installed: fall back to the pure-Python parser
+        soup = BeautifulSoup(text, 'html.parser')
+    has_archive_ext = _ARCHIVE_RE.search
+    size_re = _SIZE_RE
+
+    # The sibling/parent walks below visit the same nodes repeatedly;
+    # serialize each node's text only once.
+    text_cache = {}
+
+    def node_text(node):
+        key = id(node)
+        txt = text_cache.get(key)
+        if txt is None:
+            txt = node.get_text(' ', strip=True) if hasattr(node, 'get_text') else str(node)
+            text_cache[key] = txt
+        return txt
+
+    def nearby_nodes(tag):
+        """Yield the nodes whose text may hold `tag`'s size, nearest first:
+        the tag, its cells (for a row), up to 6 siblings on each side, then
+        the parent and up to 4 of its siblings on each side. The sibling
+        iterators are sliced lazily so long sibling runs are never listed."""
+        yield tag
+        if getattr(tag, 'name', None) == 'tr':
+            yield from tag.find_all(['td', 'th'])
+        yield from islice(getattr(tag, 'next_siblings', ()), 6)
+        yield from islice(getattr(tag, 'previous_siblings', ()), 6)
+        parent = getattr(tag, 'parent', None)
+        if parent is not None:
+            yield parent
+            yield from islice(getattr(parent, 'previous_siblings', ()), 4)
+            yield from islice(getattr(parent, 'next_siblings', ()), 4)
 
     def find_size_near(tag):
         try:
-            txt = tag.get_text(' ', strip=True) if hasattr(tag, 'get_text') else str(tag)
-            m = size_re.search(txt)
-            if m:
-                return m.group(1)
-        except Exception:
-            pass
-        try:
-            if getattr(tag, 'name', None) == 'tr':
-                for cell in tag.find_all(['td', 'th']):
-                    try:
-                        ct = cell.get_text(' ', strip=True)
-                        m = size_re.search(ct)
-                        if m:
-                            return m.group(1)
-                    except Exception:
-                        continue
-        except Exception:
-            pass
-        try:
-            for sib in list(getattr(tag, 'next_siblings', []))[:6]:
+            for node in nearby_nodes(tag):
                 try:
-                    st = sib.get_text(' ', strip=True) if hasattr(sib, 'get_text') else str(sib)
-                    m = size_re.search(st)
-                    if m:
-                        return m.group(1)
-                except Exception:
-                    continue
-            for sib in list(getattr(tag, 'previous_siblings', []))[:6]:
-                try:
-                    st = sib.get_text(' ', strip=True) if hasattr(sib, 'get_text') else str(sib)
-                    m = size_re.search(st)
+                    m = size_re.search(node_text(node))
                     if m:
                         return m.group(1)
                 except Exception:
                     continue
         except Exception:
             pass
-        try:
-            parent = getattr(tag, 'parent', None)
-            if parent is not None:
-                pt = parent.get_text(' ', strip=True) if hasattr(parent, 'get_text') else str(parent)
-                m = size_re.search(pt)
-                if m:
-                    return m.group(1)
-                for sib in list(getattr(parent, 'previous_siblings', []))[:4]:
-                    try:
-                        st = sib.get_text(' ', strip=True) if hasattr(sib, 'get_text') else str(sib)
-                        m = size_re.search(st)
-                        if m:
-                            return m.group(1)
-                    except Exception:
-                        continue
-                for sib in list(getattr(parent, 'next_siblings', []))[:4]:
-                    try:
-                        st = sib.get_text(' ', strip=True) if hasattr(sib, 'get_text') else str(sib)
-                        m = size_re.search(st)
-                        if m:
-                            return m.group(1)
-                    except Exception:
-                        continue
-        except Exception:
-            pass
         return ''
 
     def get_size_from_row(tr, anchor):
@@ -108,7 +148,7 @@ def parse_vosk_models():
                 return ''
             for td in tds[idx+1: idx+4]:
                 try:
-                    txt = td.get_text(' ', strip=True)
+                    txt = node_text(td)
                 except Exception:
                     txt = ''
                 m = size_re.search(txt)
@@ -121,34 +161,26 @@ def parse_vosk_models():
     def infer_language_from_name(name: str):
         if not name:
             return None
-        lower = name.lower()
-        padded = '-' + lower + '-'
-        code_map = {
-            'en-us': 'English', 'en-in': 'English (India)', 'en': 'English',
-            'cn': 'Chinese', 'zh-cn': 'Chinese', 'zh': 'Chinese',
-            'ru': 'Russian', 'fr': 'French', 'de': 'German', 'es': 'Spanish',
-            'pt': 'Portuguese', 'gr': 'Greek', 'tr': 'Turkish', 'vn': 'Vietnamese',
-            'it': 'Italian', 'nl': 'Dutch', 'ca': 'Catalan', 'ar-tn': 'Arabic (Tunisian)', 'ar': 'Arabic',
-            'fa': 'Farsi', 'ph': 'Filipino', 'uk': 'Ukrainian', 'kz': 'Kazakh', 'sv': 'Swedish',
-            'eo': 'Esperanto', 'hi': 'Hindi', 'cs': 'Czech', 'pl': 'Polish', 'uz': 'Uzbek',
-            'br': 'Breton', 'gu': 'Gujarati', 'tg': 'Tajik', 'te': 'Telugu', 'ky': 'Kyrgyz'
-        }
-        for code in sorted(code_map.keys(), key=lambda x: -len(x)):
-            if f'-{code}-' in padded or f'-{code}_' in padded or padded.startswith(f'-{code}-') or padded.endswith(f'-{code}-'):
-                return code_map[code]
+        padded = '-' + name.lower() + '-'
+        if _LANG_AUTOMATON is not None:
+            # one pass over the name; longest code wins, then table order
+            best = None
+            for _, hit in _LANG_AUTOMATON.iter(padded):
+                if best is None or hit < best:
+                    best = hit
+            return best[2] if best is not None else None
+        for code in _CODES_BY_LENGTH:
+            if f'-{code}-' in padded or f'-{code}_' in padded:
+                return _LANG_CODES[code]
         return None
 
     found_map = {}
 
-    heading_tags = soup.find_all(['b', 'h2', 'h3', 'h4'])
-    for h in heading_tags:
-        lang = h.get_text(strip=True)
-        if not lang:
-            continue
-        ll = lang.lower()
-        blacklist = ('model', 'models', 'list', 'punctuation', 'available', 'download')
-        if any(b in ll for b in blacklist):
-            continue
+    def process_heading(job):
+        """Collect the models listed between one heading and the next,
+        grouped by language, into a dict local to this heading."""
+        lang, h = job
+        partial = {}
         node = h.next_sibling
         steps = 0
         while node is not None and steps < 200:
@@ -161,7 +193,7 @@ def parse_vosk_models():
                     if not a:
                         continue
                     href = a['href']
-                    if not any(ext in href.lower() for ext in archive_exts):
+                    if not has_archive_ext(href):
                         continue
                     url = urljoin(r.url, href)
                     name = a.get_text(strip=True) or os.path.basename(href).split('?')[0]
@@ -169,12 +201,12 @@ def parse_vosk_models():
                     disp = name.replace('.zip', '').replace('.tar.gz', '').replace('.tgz', '').replace('.tar', '')
                     name_lang = infer_language_from_name(disp)
                     target_lang = name_lang or lang
-                    found_map.setdefault(target_lang, []).append({'name': disp, 'url': url, 'size': size})
+                    partial.setdefault(target_lang, []).append({'name': disp, 'url': url, 'size': size})
             else:
                 if hasattr(node, 'find_all'):
                     for a in node.find_all('a', href=True):
                         href = a['href']
-                        if not any(ext in href.lower() for ext in archive_exts):
+                        if not has_archive_ext(href):
                             continue
                         url = urljoin(r.url, href)
                         name = a.get_text(strip=True) or os.path.basename(href).split('?')[0]
@@ -182,14 +214,40 @@ def parse_vosk_models():
                         disp = name.replace('.zip', '').replace('.tar.gz', '').replace('.tgz', '').replace('.tar', '')
                         name_lang = infer_language_from_name(disp)
                         target_lang = name_lang or lang
-                        found_map.setdefault(target_lang, []).append({'name': disp, 'url': url, 'size': size})
+                        partial.setdefault(target_lang, []).append({'name': disp, 'url': url, 'size': size})
             node = node.next_sibling
+        return partial
+
+    blacklist = ('model', 'models', 'list', 'punctuation', 'available', 'download')
+    jobs = []
+    for h in soup.find_all(['b', 'h2', 'h3', 'h4']):
+        lang = h.get_text(strip=True)
+        if not lang:
+            continue
+        ll = lang.lower()
+        if any(b in ll for b in blacklist):
+            continue
+        jobs.append((lang, h))
+
+    # The walks only read the parse tree, so on a free-threaded interpreter
+    # the headings are scanned in parallel. With the GIL, threads would only
+    # add overhead to this pure-Python work, so the jobs run inline.
+    gil_enabled = getattr(sys, '_is_gil_enabled', lambda: True)()
+    if len(jobs) > 1 and not gil_enabled:
+        with ThreadPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as ex:
+            partials = list(ex.map(process_heading, jobs))
+    else:
+        partials = [process_heading(job) for job in jobs]
+    # merge in heading order so languages and models keep page order
+    for partial in partials:
+        for k, v in partial.items():
+            found_map.setdefault(k, []).extend(v)
 
     if not found_map:
         grouped = {}
         for a in soup.find_all('a', href=True):
             href = a['href']
-            if not any(ext in href.lower() for ext in archive_exts):
+            if not has_archive_ext(href):
                 continue
             url = urljoin(r.url, href)
             name = a.get_text(strip=True) or os.path.basename(href).split('?')[0]
@@ -207,6 +265,6 @@ def parse_vosk_models():
 if __name__ == '__main__':
     try:
         res = parse_vosk_models()
-        print(json.dumps(res, indent=2, ensure_ascii=False))
+        print(_dumps_pretty(res))
     except Exception as e:
         print('Error:', e)
@@ -6,19 +6,125 @@ and `transformers` is available. The goal is to provide a safe, dependency-
 aware post-processor that can be used in-process or replaced with a more
 capable implementation later.
 """
+import os
 import re
-from typing import Optional
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+_TERMINATORS = '.?!'
+# Anything `_rule_punctuate` would still change in single-spaced text: a
+# lone lowercase 'i', or a lowercase letter starting a new sentence.
+_RULE_WORK = re.compile(r"(?<!\w)i(?!\w)|[.?!][\"']? [a-z]")
+
+
+def _batch_size() -> int:
+    """Pipeline batch size, overridable through VAICCS_PUNCT_BATCH."""
+    try:
+        return max(1, int(os.environ.get('VAICCS_PUNCT_BATCH', '8')))
+    except ValueError:
+        return 8
+
+
+def _reduce_precision(model):
+    """Apply VAICCS_PUNCT_DTYPE to a loaded seq2seq model.
+
+    'bf16' casts the weights to bfloat16 and 'int8' dynamically quantizes
+    the Linear layers; both roughly halve the bytes moved per token on CPU.
+    Unset or anything else keeps full precision. Falls back to the model as
+    loaded if the conversion fails.
+    """
+    choice = os.environ.get('VAICCS_PUNCT_DTYPE', '').strip().lower()
+    if choice not in ('bf16', 'bfloat16', 'int8', 'qint8'):
+        return model
+    try:
+        import torch
+        if choice in ('bf16', 'bfloat16'):
+            return model.to(torch.bfloat16)
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    except Exception:
+        return model
+
+
+def _generated_text(v, fallback: str) -> str:
+    # many pipelines return dicts with 'generated_text' or 'summary_text'
+    if isinstance(v, list):
+        if not v:
+            return fallback
+        v = v[0]
+    if isinstance(v, dict):
+        return v.get('generated_text') or v.get('summary_text') or str(v)
+    return str(v)
+
+
+def _is_word_char(c: str) -> bool:
+    # same test as the regex \w class
+    return c.isalnum() or c == '_'
+
+
+def _rule_punctuate(text: str) -> str:
+    """Rule-based punctuation in one pass over the words of `text`.
+
+    Collapses whitespace, capitalizes a standalone 'i', the first letter
+    and any a-z letter that follows a sentence terminator (optionally
+    followed by a closing quote), and appends '.' when the text does not
+    end with a terminator.
+    """
+    # Already well-formed (e.g. model output): capitalized, terminated,
+    # single-spaced with no other whitespace, nothing left to capitalize.
+    if (text[:1].isupper() and text.endswith(('.', '?', '!')) and text.isprintable()
+            and '  ' not in text and not _RULE_WORK.search(text)):
+        return text
+    words = text.split()
+    if not words:
+        return '.'
+    prev = ''
+    for k, w in enumerate(words):
+        if 'i' in w:
+            if w == 'i':
+                w = 'I'
+            else:
+                j = w.find('i')
+                while j != -1:
+                    if (j == 0 or not _is_word_char(w[j - 1])) and (j + 1 == len(w) or not _is_word_char(w[j + 1])):
+                        w = w[:j] + 'I' + w[j + 1:]
+                    j = w.find('i', j + 1)
+        if k == 0:
+            w = w[0].upper() + w[1:]
+        elif 'a' <= w[0] <= 'z' and (prev[-1] in _TERMINATORS or (len(prev) > 1 and prev[-1] in '"\'' and prev[-2] in _TERMINATORS)):
+            w = w[0].upper() + w[1:]
+        words[k] = w
+        prev = w
+    s = ' '.join(words)
+    if s[-1] not in _TERMINATORS:
+        s += '.'
+    return s
 
 
 class Punctuator:
-    def __init__(self, mode: str = "rule", hf_pipeline: Optional[object] = None):
+    # model-backed punctuators built by from_path, keyed by the path given
+    _instances: Dict[str, "Punctuator"] = {}
+    _instances_lock = threading.Lock()
+    # model outputs remembered per stripped input: live recognition often
+    # produces the same short phrase again
+    RESULT_CACHE_SIZE = 1024
+
+    def __init__(self, mode: str = "rule", hf_pipeline: Optional[object] = None,
+                 tokenizer: Optional[object] = None, model: Optional[object] = None):
         """Create a punctuator.
 
-        mode: 'rule' or 'hf'
+        mode: 'rule', 'hf' or 'onnx'
         hf_pipeline: optional transformers pipeline object used when mode == 'hf'
+        tokenizer, model: optional seq2seq tokenizer/model pair used directly
+            (preferred over `hf_pipeline`); for 'onnx' the model is an
+            ONNX Runtime-backed optimum model
         """
         self.mode = mode
         self.hf_pipeline = hf_pipeline
+        self.tokenizer = tokenizer
+        self.model = model
+        self._results = OrderedDict()
+        self._results_lock = threading.Lock()
 
     @staticmethod
     def from_path(path: Optional[str]):
@@ -29,25 +135,76 @@ class Punctuator:
         Face model id / local dir and an attempt is made to build a
         `transformers` pipeline. If `transformers` is not available or the
         load fails, falls back to the rule-based implementation and does
-        not raise.
+        not raise. A local folder containing an exported ONNX model is run
+        through ONNX Runtime when `optimum` is installed.
+
+        Successfully loaded models are cached per `path`, so restarting the
+        engine does not rebuild the pipeline. Failed loads are not cached and
+        are retried on the next call.
         """
         if not path:
             return Punctuator(mode="rule")
+        with Punctuator._instances_lock:
+            cached = Punctuator._instances.get(path)
+            if cached is None:
+                cached = Punctuator._load(path)
+                if cached.mode != 'rule':
+                    Punctuator._instances[path] = cached
+            return cached
+
+    @staticmethod
+    def _load(path: str):
+        """Build a Punctuator for a non-empty `path` (uncached)."""
         # Accept forms like 'hf:facebook/your-model' or a plain path/model id
         model_id = path
         if path.startswith('hf:'):
             model_id = path[3:]
 
+        onnx_model = Punctuator._load_onnx(model_id)
+        if onnx_model is not None:
+            return onnx_model
+
+        try:
+            # Load the seq2seq model directly so batches run as one padded
+            # generate() call; pipelines loop over list inputs one at a time.
+            from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+            tokenizer = AutoTokenizer.from_pretrained(model_id)
+            model = _reduce_precision(AutoModelForSeq2SeqLM.from_pretrained(model_id))
+            model.eval()
+            return Punctuator(mode="hf", tokenizer=tokenizer, model=model)
+        except Exception:
+            pass
+
         try:
             from transformers import pipeline
             # Use a text2text generation pipeline; many punctuation models are
             # available as seq2seq transformers. This is optional and best-effort.
-            hf_pipe = pipeline('text2text-generation', model=model_id, device=-1)
+            hf_pipe = pipeline('text2text-generation', model=model_id, device=-1, batch_size=_batch_size())
             return Punctuator(mode="hf", hf_pipeline=hf_pipe)
         except Exception:
             # Could not load HF pipeline; fall back to rule-based.
             return Punctuator(mode="rule")
 
+    @staticmethod
+    def _load_onnx(model_id: str):
+        """Return an 'onnx' Punctuator when `model_id` is a local folder with an
+        exported ONNX seq2seq model and optimum/onnxruntime are installed,
+        else None."""
+        try:
+            if not os.path.isdir(model_id) or not any(f.endswith('.onnx') for f in os.listdir(model_id)):
+                return None
+            import onnxruntime as ort
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+            from transformers import AutoTokenizer
+            so = ort.SessionOptions()
+            so.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            so.intra_op_num_threads = os.cpu_count() or 1
+            model = ORTModelForSeq2SeqLM.from_pretrained(model_id, provider='CPUExecutionProvider', session_options=so)
+            tokenizer = AutoTokenizer.from_pretrained(model_id)
+            return Punctuator(mode="onnx", tokenizer=tokenizer, model=model)
+        except Exception:
+            return None
+
     def punctuate(self, text: str) -> str:
         """Return punctuated and cased text.
 
@@ -59,43 +216,89 @@ class Punctuator:
         if not text:
             return text
         try:
-            if self.mode == 'hf' and self.hf_pipeline is not None:
-                # transformers pipeline expects reasonable-length input; trim
-                # whitespace and run the model, returning the generated text.
-                out = self.hf_pipeline(text, truncation=True)
-                if isinstance(out, list) and len(out) > 0:
-                    # many pipelines return dicts with 'generated_text' or 'summary_text'
-                    v = out[0]
-                    if isinstance(v, dict):
-                        return v.get('generated_text') or v.get('summary_text') or str(v)
-                    return str(v)
-                return text
+            if self._uses_model():
+                key = text.strip()
+                result = self._cached(key)
+                if result is None:
+                    result = self._model_punctuate(text)
+                    self._remember(key, result)
+                return result
 
             # Rule-based fallback
-            s = text.strip()
-            # Normalize whitespace
-            s = re.sub(r"\s+", " ", s)
+            return _rule_punctuate(text)
+        except Exception:
+            return text
 
-            # Capitalize 'i' as a standalone word
-            s = re.sub(r"\bi\b", "I", s)
+    def punctuate_batch(self, texts: List[str]) -> List[str]:
+        """Punctuate several texts at once; returns one result per input.
 
-            # Capitalize first letter of the string
-            if s:
-                s = s[0].upper() + s[1:]
+        In 'hf'/'onnx' mode the non-empty texts go through the model as a single
+        padded batch instead of one call per caption. Falls back to per-text
+        `punctuate` if the batched call fails.
+        """
+        if self._uses_model():
+            results = list(texts)
+            idx = []
+            for i, t in enumerate(texts):
+                if t:
+                    hit = self._cached(t.strip())
+                    if hit is None:
+                        idx.append(i)
+                    else:
+                        results[i] = hit
+            batch = [texts[i] for i in idx]
+            try:
+                if not batch:
+                    outs = []
+                elif self.model is not None:
+                    outs = self._generate(batch)
+                else:
+                    outs = self.hf_pipeline(batch, truncation=True, batch_size=len(batch))
+                if isinstance(outs, list) and len(outs) == len(idx):
+                    for i, v in zip(idx, outs):
+                        results[i] = _generated_text(v, texts[i])
+                        self._remember(texts[i].strip(), results[i])
+                    return results
+            except Exception:
+                pass
+        return [self.punctuate(t) for t in texts]
 
-            # Capitalize after sentence-ending punctuation
-            def _cap_after(m):
-                return m.group(1) + m.group(2).upper()
+    def _uses_model(self) -> bool:
+        return self.mode in ('hf', 'onnx') and (self.model is not None or self.hf_pipeline is not None)
 
-            s = re.sub(r"([\.\?\!][\"']?\s+)([a-z])", _cap_after, s)
+    def _model_punctuate(self, text: str) -> str:
+        if self.model is not None:
+            return self._generate([text])[0]
+        # transformers pipeline expects reasonable-length input; run the
+        # model and return the generated text.
+        out = self.hf_pipeline(text, truncation=True)
+        if isinstance(out, list) and len(out) > 0:
+            return _generated_text(out[0], text)
+        return text
 
-            # Ensure sentence terminator at end
-            if not re.search(r'[\.\?\!]\s*$', s):
-                s = s + '.'
+    def _cached(self, key: str) -> Optional[str]:
+        with self._results_lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+            return result
 
-            return s
-        except Exception:
-            return text
+    def _remember(self, key: str, result: str) -> None:
+        with self._results_lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            if len(self._results) > self.RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+
+    def _generate(self, texts: List[str]) -> List[str]:
+        """Run the tokenizer/model pair on non-empty `texts` as one batch."""
+        import torch
+        enc = self.tokenizer(texts, padding=True, truncation=True, return_tensors='pt')
+        # punctuation and casing add only a few tokens to the input
+        max_new_tokens = int(enc['input_ids'].shape[1] * 1.5) + 8
+        with torch.inference_mode():
+            out = self.model.generate(**enc, max_new_tokens=max_new_tokens)
+        return self.tokenizer.batch_decode(out, skip_special_tokens=True)
 
 
 def simple_punctuate(text: str) -> str:
@@ -370,7 +370,7 @@ class CasePuncPredictor:
     def tokenize(self, text):
         return [self.config.cls_token] + self.config.tokenizer.tokenize(text) + [self.config.sep_token]
 
-    def predict(self, tokens, getter=lambda x: x):
+    def predict(self, tokens, getter=None):
         max_length = self.config.max_length
         device = self.config.device
         if type(tokens) == str:
@@ -378,10 +378,12 @@ class CasePuncPredictor:
         previous_label = punctuation['PERIOD']
         for start in range(0, len(tokens), max_length):
             instance = tokens[start: start + max_length]
-            if type(getter(instance[0])) == str:
-                ids = self.config.tokenizer.convert_tokens_to_ids(getter(token) for token in instance)
+            # without a getter the tokens are used as-is, so skip the per-token call
+            values = instance if getter is None else list(map(getter, instance))
+            if type(values[0]) == str:
+                ids = self.config.tokenizer.convert_tokens_to_ids(values)
             else:
-                ids = [getter(token) for token in instance]
+                ids = list(values)
             if len(ids) < max_length:
                 ids += [0] * (max_length - len(ids))
             x = torch.tensor([ids]).long().to(device)
@@ -468,6 +470,7 @@ def generate_predictions(config, checkpoint_path):
         previous_label = punctuation['PERIOD']
         first_time = True
         was_word = False
+        parts = []
         for start in range(0, len(tokens), config.max_length):
             instance = tokens[start: start + config.max_length]
             ids = config.tokenizer.convert_tokens_to_ids(instance)
@@ -492,28 +495,28 @@ def generate_predictions(config, checkpoint_path):
                     if token.endswith('</w>'):
                         cased_token = recase(token[:-4], case_label)
                         if was_word:
-                            print(' ', end='')
-                        print(cased_token + punctuation_syms[punc_label], end='')
+                            parts.append(' ')
+                        parts.append(cased_token + punctuation_syms[punc_label])
                         was_word = True
                     else:
                         cased_token = recase(token, case_label)
                         if was_word:
-                            print(' ', end='')
-                        print(cased_token, end='')
+                            parts.append(' ')
+                        parts.append(cased_token)
                         was_word = False
                 else:
                     if token.startswith('##'):
                         cased_token = recase(token[2:], case_label)
-                        print(cased_token, end='')
+                        parts.append(cased_token)
                     else:
                         cased_token = recase(token, case_label)
                         if not first_time:
-                            print(' ', end='')
+                            parts.append(' ')
                         first_time = False
-                        print(cased_token + punctuation_syms[punc_label], end='')
+                        parts.append(cased_token + punctuation_syms[punc_label])
         if previous_label == 0:
-            print('.', end='')
-        print()
+            parts.append('.')
+        print(''.join(parts))
 
 
 def label_for_case(token):
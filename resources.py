@@ -2,47 +2,82 @@ import os
 import sys
 import shutil
 import json
+import functools
 
-def _resource_path(relpath: str) -> str:
-    """Resolve a resource file path similar to the logic used elsewhere.
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
 
-    Preference order:
-    1) directory of the launched executable
-    2) current working directory
-    3) PyInstaller extraction folder (sys._MEIPASS)
-    4) module directory
-    """
-    try:
-        exe_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
-        p = os.path.join(exe_dir, relpath)
-        if os.path.exists(p):
-            return p
-    except Exception:
-        pass
+# ioctl(2) request that makes a copy-on-write clone of a whole file
+# (Btrfs, XFS, bcachefs, ...).
+_FICLONE = 0x40049409
 
+def _static_dir(fn):
     try:
-        p = os.path.join(os.getcwd(), relpath)
-        if os.path.exists(p):
-            return p
+        return fn()
     except Exception:
-        pass
+        return None
+
+
+# Search roots that cannot change while the app runs, computed once. The
+# working directory is read on each lookup since it can change.
+_EXE_DIR = _static_dir(lambda: os.path.dirname(os.path.abspath(sys.argv[0])))
+_MEIPASS_DIR = getattr(sys, '_MEIPASS', None)
+_MODULE_DIR = _static_dir(lambda: os.path.dirname(__file__))
 
+# (relpath, cwd) -> existing path found by `_find_resource`. Misses are not
+# cached so a file dropped in place later is still picked up.
+_RESOURCE_PATH_CACHE = {}
+
+
+def _find_resource(relpath: str):
+    """Return the first existing copy of `relpath` in the exe directory, the
+    current working directory or the PyInstaller folder, else None."""
     try:
-        meipass = getattr(sys, '_MEIPASS', None)
-        if meipass:
-            p = os.path.join(meipass, relpath)
+        cwd = os.getcwd()
+    except Exception:
+        cwd = None
+    key = (relpath, cwd)
+    found = _RESOURCE_PATH_CACHE.get(key)
+    if found is not None:
+        return found
+    for base in (_EXE_DIR, cwd, _MEIPASS_DIR):
+        if not base:
+            continue
+        try:
+            p = os.path.join(base, relpath)
             if os.path.exists(p):
+                _RESOURCE_PATH_CACHE[key] = p
                 return p
-    except Exception:
-        pass
+        except Exception:
+            continue
+    return None
+
+
+def _resource_path(relpath: str) -> str:
+    """Resolve a resource file path similar to the logic used elsewhere.
+
+    Preference order:
+    1) directory of the launched executable
+    2) current working directory
+    3) PyInstaller extraction folder (sys._MEIPASS)
+    4) module directory
 
+    Hits are memoized per working directory.
+    """
+    found = _find_resource(relpath)
+    if found is not None:
+        return found
     try:
-        p = os.path.join(os.path.dirname(__file__), relpath)
-        return p
+        return os.path.join(_MODULE_DIR, relpath)
     except Exception:
         return relpath
 
 
+# Resolved (and created) once per app name; later calls skip the env
+# lookups and the makedirs stat.
+@functools.lru_cache(maxsize=None)
 def get_user_data_dir(app_name: str = "ClosedCaptioning") -> str:
     base = os.getenv('APPDATA') or os.getenv('LOCALAPPDATA') or os.path.expanduser('~')
     path = os.path.join(base, app_name)
@@ -53,6 +88,27 @@ def get_user_data_dir(app_name: str = "ClosedCaptioning") -> str:
     return path
 
 
+def _clone_or_copy(src: str, dst: str) -> None:
+    """Copy `src` to `dst`, sharing extents with a reflink when possible.
+
+    A hard link is not an option: the user copy is rewritten in place and
+    would change the bundled original along with it.
+    """
+    if fcntl is not None and sys.platform.startswith('linux'):
+        try:
+            with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+            shutil.copystat(src, dst)
+            return
+        except OSError:
+            # not supported by this filesystem (or across devices)
+            try:
+                os.remove(dst)
+            except OSError:
+                pass
+    shutil.copy2(src, dst)
+
+
 def ensure_user_resource(relpath: str) -> str:
     """Ensure a copy of `relpath` exists under the user's appdata folder.
 
@@ -68,15 +124,23 @@ def ensure_user_resource(relpath: str) -> str:
         return dst
 
     # Try to locate a bundled/source file and copy it into appdata
-    src = _resource_path(relpath)
+    src = _find_resource(relpath)
+    if src is None:
+        # module directory, the last place `_resource_path` looks
+        try:
+            src = os.path.join(_MODULE_DIR, relpath)
+            if not os.path.exists(src):
+                src = None
+        except Exception:
+            src = None
     try:
-        if os.path.exists(src):
+        if src is not None:
             try:
                 os.makedirs(os.path.dirname(dst), exist_ok=True)
             except Exception:
                 pass
             try:
-                shutil.copy2(src, dst)
+                _clone_or_copy(src, dst)
                 return dst
             except Exception:
                 pass
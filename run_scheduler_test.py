@@ -6,16 +6,21 @@ CaptionEngine in demo mode and observe `[DEMO]` messages in the log.
 """
 
 import argparse
+import bisect
+import functools
 import logging
 import threading
 import time
 from datetime import datetime, timedelta
 
-from automations import AutomationManager, ShowAutomation
+from automations import DAY_NAMES, AutomationManager, ShowAutomation
 
 
 LOG_PATH = 'scheduler_test.log'
 
+# 100ms of 16-bit mono silence at 16kHz; the same object is queued every time
+_SILENCE_FRAME: bytes = bytes(3200)
+
 
 def setup_logging():
     logging.basicConfig(
@@ -29,23 +34,70 @@ def setup_logging():
 
 
 class TestAutomationManager(AutomationManager):
+    # Real seconds per loop iteration while a show is running
+    TICK_SECONDS = 0.5
+
     def __init__(self):
         super().__init__()
         self._test_now = datetime.now().replace(second=0, microsecond=0)
         self._lock = threading.Lock()
+        # wakes the loop when the clock moves or the scheduler is stopped
+        self._cv = threading.Condition(self._lock)
+        # sorted start times as minutes since Monday 00:00
+        self._start_keys: list[int] = []
+        # immutable copy of self.automations for the loop to iterate
+        self._automations_snapshot: tuple = ()
+
+    def _rebuild_events(self):
+        with self._lock:
+            self._automations_snapshot = tuple(self.automations)
+        keys = []
+        for a in self.automations:
+            start = self._time_to_minutes(a.start_time)
+            keys.extend(DAY_NAMES.index(d) * 1440 + start for d in a.days if d in DAY_NAMES)
+        keys.sort()
+        self._start_keys = keys
+
+    def add_automation(self, automation: ShowAutomation) -> None:
+        super().add_automation(automation)
+        self._rebuild_events()
+
+    def remove_automation(self, index: int) -> None:
+        super().remove_automation(index)
+        self._rebuild_events()
+
+    def set_automations(self, automations) -> None:
+        super().set_automations(automations)
+        self._rebuild_events()
+
+    def _snapshot(self) -> tuple[int, str]:
+        with self._lock:
+            now = self._test_now
+        return now.hour * 60 + now.minute, DAY_NAMES[now.weekday()]
 
     def _get_current_time_minutes(self) -> int:
-        with self._lock:
-            return self._test_now.hour * 60 + self._test_now.minute
+        return self._snapshot()[0]
 
     def _get_current_day_name(self) -> str:
-        with self._lock:
-            day_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-            return day_names[self._test_now.weekday()]
+        return self._snapshot()[1]
 
     def advance_minutes(self, minutes: int = 1):
-        with self._lock:
+        with self._cv:
             self._test_now = self._test_now + timedelta(minutes=minutes)
+            self._cv.notify_all()
+
+    def _minutes_until_next_start(self) -> int:
+        """Minutes until the next scheduled start, found by bisecting the week index."""
+        keys = self._start_keys
+        if not keys:
+            return 1
+        with self._lock:
+            now = self._test_now
+        now_key = now.weekday() * 1440 + now.hour * 60 + now.minute
+        i = bisect.bisect_right(keys, now_key)
+        if i < len(keys):
+            return keys[i] - now_key
+        return keys[0] + 7 * 1440 - now_key
 
     def start_scheduler(self):
         if self._scheduler_running:
@@ -54,13 +106,22 @@ class TestAutomationManager(AutomationManager):
         self._scheduler_thread = threading.Thread(target=self._test_scheduler_loop, daemon=True)
         self._scheduler_thread.start()
 
+    def stop_scheduler(self):
+        with self._cv:
+            self._scheduler_running = False
+            self._cv.notify_all()
+        if self._scheduler_thread:
+            self._scheduler_thread.join(timeout=2)
+
     def _test_scheduler_loop(self):
         logging.info("Test scheduler loop starting")
         try:
             while self._scheduler_running:
                 try:
-                    for automation in list(self.automations):
-                        should_trigger, is_start = self._check_automation_trigger(automation)
+                    # one locked clock read per pass, shared by every check below
+                    now = self._snapshot()
+                    for automation in self._automations_snapshot:
+                        should_trigger, is_start = self._check_automation_trigger(automation, now)
                         if should_trigger:
                             if is_start and self._active_automation != automation:
                                 logging.info(f"Trigger START for automation: {automation.name}")
@@ -79,7 +140,7 @@ class TestAutomationManager(AutomationManager):
                                     logging.exception("Error in automation stop callback")
 
                     if self._active_automation:
-                        should_trigger, is_start = self._check_automation_trigger(self._active_automation)
+                        should_trigger, is_start = self._check_automation_trigger(self._active_automation, now)
                         if not should_trigger and not is_start:
                             logging.info(f"Trigger STOP for automation: {self._active_automation.name}")
                             self._active_automation = None
@@ -89,8 +150,14 @@ class TestAutomationManager(AutomationManager):
                                 except Exception:
                                     logging.exception("Error in automation stop callback")
 
-                    self.advance_minutes(1)
-                    time.sleep(0.5)
+                    # Nothing can fire before the next start time, so jump the
+                    # clock straight there instead of stepping minute by minute.
+                    if self._active_automation is None:
+                        self.advance_minutes(self._minutes_until_next_start())
+                    else:
+                        self.advance_minutes(1)
+                    with self._cv:
+                        self._cv.wait_for(lambda: not self._scheduler_running, timeout=self.TICK_SECONDS)
                 except Exception:
                     logging.exception("Error inside test scheduler loop")
                     self._scheduler_running = False
@@ -98,8 +165,22 @@ class TestAutomationManager(AutomationManager):
             logging.info("Test scheduler loop exiting")
 
 
+@functools.lru_cache(maxsize=1440)
+def _fmt_hm(hour: int, minute: int) -> str:
+    # always 'AM'/'PM' (what automations parses), whatever the locale's %p is
+    return f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
 def fmt_time(dt: datetime) -> str:
-    return dt.strftime('%I:%M %p').lstrip('0')
+    return _fmt_hm(dt.hour, dt.minute)
+
+
+def _wait_engine_stopped(engine, timeout: float = 5.0) -> bool:
+    """Join the engine thread for up to `timeout` seconds; True if it exited."""
+    t = getattr(engine, '_thread', None)
+    if t is not None:
+        t.join(timeout)
+    return not (t is not None and t.is_alive())
 
 
 def main(demo_engine: bool = False):
@@ -107,14 +188,20 @@ def main(demo_engine: bool = False):
     logging.info("Starting scheduler backend test")
 
     events = []
+    # set once both a start and a stop have been recorded
+    events_ready = threading.Event()
 
     def on_start_default():
-        logging.info(f"on_start called at {datetime.now().isoformat()}")
-        events.append(('start', datetime.now()))
+        ts = datetime.now()
+        logging.info(f"on_start called at {ts.isoformat()}")
+        events.append(('start', ts))
 
     def on_stop_default():
-        logging.info(f"on_stop called at {datetime.now().isoformat()}")
-        events.append(('stop', datetime.now()))
+        ts = datetime.now()
+        logging.info(f"on_stop called at {ts.isoformat()}")
+        events.append(('stop', ts))
+        if any(e[0] == 'start' for e in events):
+            events_ready.set()
 
     mgr = TestAutomationManager()
     now = mgr._test_now
@@ -142,14 +229,16 @@ def main(demo_engine: bool = False):
                 logging.info(f"engine callback: {text}")
 
             def _producer(timeout_seconds: int):
-                end = time.time() + timeout_seconds
-                dummy = b"\x00" * 3200
-                while time.time() < end and not getattr(engine, '_stop_event', threading.Event()).is_set():
+                stop_evt = getattr(engine, '_stop_event', None) or threading.Event()
+                deadline = time.monotonic() + timeout_seconds
+                while time.monotonic() < deadline and not stop_evt.is_set():
                     try:
-                        q.put(dummy)
+                        q.put(_SILENCE_FRAME)
                     except Exception:
                         pass
-                    time.sleep(0.2)
+                    # returns early as soon as the engine is stopped
+                    if stop_evt.wait(0.2):
+                        break
 
             def on_start():
                 on_start_default()
@@ -164,13 +253,10 @@ def main(demo_engine: bool = False):
                     engine.stop()
                     # wait briefly for the engine thread to exit
                     try:
-                        t0 = time.time()
-                        while getattr(engine, '_thread', None) and engine._thread.is_alive() and (time.time() - t0) < 5.0:
-                            time.sleep(0.1)
-                        if getattr(engine, '_thread', None) and engine._thread.is_alive():
-                            logging.warning("Engine thread did not exit within timeout after stop()")
-                        else:
+                        if _wait_engine_stopped(engine):
                             logging.info("Engine stopped successfully")
+                        else:
+                            logging.warning("Engine thread did not exit within timeout after stop()")
                     except Exception:
                         pass
                 except Exception:
@@ -191,12 +277,8 @@ def main(demo_engine: bool = False):
     mgr.start_scheduler()
 
     timeout = 20
-    deadline = time.time() + timeout
     try:
-        while time.time() < deadline:
-            if any(e[0] == 'start' for e in events) and any(e[0] == 'stop' for e in events):
-                break
-            time.sleep(0.2)
+        events_ready.wait(timeout)
     finally:
         try:
             mgr.stop_scheduler()
@@ -207,9 +289,7 @@ def main(demo_engine: bool = False):
                 engine.stop()
                 # ensure thread is stopped before exiting
                 try:
-                    t0 = time.time()
-                    while getattr(engine, '_thread', None) and engine._thread.is_alive() and (time.time() - t0) < 5.0:
-                        time.sleep(0.1)
+                    _wait_engine_stopped(engine)
                 except Exception:
                     pass
             except Exception:
@@ -9,58 +9,102 @@ Usage:
   python run_test.py            # runs all test_*.py files
   python run_test.py test_a.py  # run a single test file or a list of files
 
+Tests run one at a time by default. Set VAICCS_TEST_JOBS=N to run up to N
+concurrently (0 = one per CPU); only do so for tests that don't share
+files such as license.json.
+
 This runner purposely invokes each test as a subprocess so tests that are not
 unittest-style (ad-hoc scripts) will still run and report their exit codes.
 """
 from __future__ import annotations
 
-import glob
+import fnmatch
 import os
+import re
 import sys
 import subprocess
 import textwrap
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 
 BASE = os.path.abspath(os.path.dirname(__file__))
 
+# Lines of each output stream kept per test; older lines are dropped.
+OUTPUT_TAIL_LINES = 2000
+
+# stderr of a test that failed only because an optional dependency is missing
+_SKIP_RE = re.compile(r"ModuleNotFoundError|No module named")
+
 
 def find_tests(pattern: str = "test_*.py") -> List[str]:
-    # search top-level only to avoid running deeper library tests/built artifacts
-    files = []
-    for p in glob.glob(os.path.join(BASE, pattern)):
-        # exclude build folders explicitly if file paths contain them
-        if any(part in p.replace('\\', '/') for part in ('build/', 'dist/', '__pycache__')):
-            continue
-        files.append(os.path.abspath(p))
-    files.sort()
-    return files
+    # search top-level only to avoid running deeper library tests/built artifacts;
+    # build/, dist/ and __pycache__ are subdirectories, so they are never entered
+    with os.scandir(BASE) as it:
+        return sorted(os.path.join(BASE, e.name) for e in it
+                      if fnmatch.fnmatch(e.name, pattern) and e.is_file())
+
+
+def _jobs(n_tests: int) -> int:
+    # sequential unless asked: several tests save/load/delete the same
+    # license.json and would race each other
+    try:
+        jobs = int(os.environ.get("VAICCS_TEST_JOBS", "1"))
+    except ValueError:
+        jobs = 1
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    return max(1, min(jobs, n_tests))
+
+
+def _drain(stream, tail: deque) -> None:
+    with stream:
+        for line in stream:
+            tail.append(line)
 
 
 def run_test(path: str, timeout: float = 60.0) -> dict:
     cmd = [sys.executable, path]
+    # Drain both pipes as the test runs, keeping only the tail of each, so a
+    # noisy test cannot fill the pipe or hold its whole output in memory.
+    out_tail: deque = deque(maxlen=OUTPUT_TAIL_LINES)
+    err_tail: deque = deque(maxlen=OUTPUT_TAIL_LINES)
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, bufsize=1, text=True)
+    drains = [threading.Thread(target=_drain, args=(proc.stdout, out_tail), daemon=True),
+              threading.Thread(target=_drain, args=(proc.stderr, err_tail), daemon=True)]
+    for t in drains:
+        t.start()
     try:
-        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
-        ret = {
-            "path": path,
-            "returncode": proc.returncode,
-            "stdout": proc.stdout,
-            "stderr": proc.stderr,
-        }
-        # Detect obvious missing-module import failures and mark as skipped.
-        # We consider patterns like "ModuleNotFoundError: No module named 'X'" or
-        # "ImportError: No module named X" as skip reasons for optional deps.
-        err = (proc.stderr or "")
-        if proc.returncode != 0 and ("No module named" in err or "ModuleNotFoundError" in err):
-            # extract a brief reason (first line of stderr)
-            first_line = err.strip().splitlines()[0] if err.strip() else ""
-            ret["skipped"] = True
-            ret["skip_reason"] = first_line
-        else:
-            ret["skipped"] = False
-        return ret
-    except subprocess.TimeoutExpired as e:
-        return {"path": path, "returncode": 124, "stdout": e.stdout or "", "stderr": f"TIMEOUT after {timeout}s", "skipped": False}
+        proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        # a grandchild may still hold the pipes open; don't wait on it forever
+        for t in drains:
+            t.join(timeout=5.0)
+        return {"path": path, "returncode": 124, "stdout": "".join(out_tail), "stderr": f"TIMEOUT after {timeout}s", "skipped": False}
+    for t in drains:
+        t.join()
+    ret = {
+        "path": path,
+        "returncode": proc.returncode,
+        "stdout": "".join(out_tail),
+        "stderr": "".join(err_tail),
+    }
+    # Detect obvious missing-module import failures and mark as skipped.
+    # We consider patterns like "ModuleNotFoundError: No module named 'X'" or
+    # "ImportError: No module named X" as skip reasons for optional deps.
+    err = ret["stderr"]
+    if proc.returncode != 0 and _SKIP_RE.search(err):
+        # extract a brief reason (first line of stderr)
+        first_line = err.strip().splitlines()[0] if err.strip() else ""
+        ret["skipped"] = True
+        ret["skip_reason"] = first_line
+    else:
+        ret["skipped"] = False
+    return ret
 
 
 def print_report(results: List[dict]):
@@ -111,11 +155,14 @@ def main(argv: List[str] | None = None) -> int:
         print("No test_*.py files found in the repository root.")
         return 0
 
-    results = []
-    for t in tests:
-        print(f"Running: {os.path.relpath(t, BASE)} ...")
-        res = run_test(t, timeout=120.0)
-        results.append(res)
+    def _run(t):
+        print(f"Running: {os.path.relpath(t, BASE)} ...", flush=True)
+        return run_test(t, timeout=120.0)
+
+    # each test is its own subprocess, so threads only wait on them; map()
+    # keeps the results in discovery order for the report
+    with ThreadPoolExecutor(max_workers=_jobs(len(tests))) as ex:
+        results = list(ex.map(_run, tests))
 
     print_report(results)
 
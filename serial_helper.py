@@ -6,9 +6,11 @@ lines. Also exposes `list_serial_ports()` to enumerate available COM ports.
 This module avoids opening a port at import time so importing it is safe
 when pyserial is not available; callers should handle missing dependency.
 """
+import queue
 import sys
+import threading
 import time
-from typing import List, Optional
+from typing import Iterable, List, Optional
 
 try:
     import serial
@@ -17,6 +19,9 @@ except Exception:
     serial = None
     list_ports = None
 
+# Line terminator appended to every caption line
+_CRLF = b"\r\n"
+
 # On Windows we can also query the registry for SerialCOMM mappings which
 # sometimes list USB<->COM mappings that help detect USB-to-RS232 adapters
 _have_winreg = False
@@ -27,15 +32,45 @@ except Exception:
     _have_winreg = False
 
 
-def list_serial_ports() -> List[str]:
+# Port enumeration is slow on Windows (SetupDi plus a registry walk) while the
+# set of ports rarely changes, so results are reused for a short time.
+_PORTS_TTL = 2.0
+# include_registry -> (monotonic timestamp, ports)
+_ports_cache = {}
+
+
+def invalidate_serial_port_cache() -> None:
+    """Force the next `list_serial_ports()` call to enumerate again."""
+    _ports_cache.clear()
+
+
+def list_serial_ports(refresh: bool = False, include_registry: bool = False) -> List[str]:
     """Return a list of available serial ports as dictionaries.
 
     Each item is a dict with keys: 'device', 'description', 'hwid', 'vid', 'pid', 'manufacturer'.
     This provides extra context for USB-to-RS232 adapters (shows VID/PID and description).
 
+    Results are cached for `_PORTS_TTL` seconds; pass `refresh=True` (e.g. for
+    a user-requested refresh) to enumerate again immediately.
+
+    On Windows the SERIALCOMM registry map is only read when pyserial found
+    no ports, unless `include_registry=True` (e.g. for diagnostics).
+
     If pyserial is not installed, returns an empty list.
     """
+    now = time.monotonic()
+    key = bool(include_registry)
+    cached = _ports_cache.get(key)
+    if refresh or cached is None or now - cached[0] >= _PORTS_TTL:
+        cached = (now, _enumerate_serial_ports(key))
+        _ports_cache[key] = cached
+    # copies, so callers can't modify the cached entries
+    return [dict(r) for r in cached[1]]
+
+
+def _enumerate_serial_ports(include_registry: bool = False) -> List[dict]:
     results = []
+    seen = set()  # devices already in results
 
     # first try pyserial if available
     if list_ports is not None:
@@ -50,12 +85,15 @@ def list_serial_ports() -> List[str]:
                     "manufacturer": getattr(p, "manufacturer", ""),
                 }
                 results.append(info)
+                seen.add(info["device"])
         except Exception:
             # ignore pyserial enumeration errors
             pass
 
-    # On Windows, augment with registry entries from HARDWARE\DEVICEMAP\SERIALCOMM
-    if _have_winreg:
+    # On Windows, augment with registry entries from HARDWARE\DEVICEMAP\SERIALCOMM.
+    # comports() (SetupDi) normally lists the same devices already, so this
+    # second walk is a fallback unless explicitly requested.
+    if _have_winreg and (include_registry or not results):
         try:
             key_path = r"HARDWARE\DEVICEMAP\SERIALCOMM"
             with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path) as k:
@@ -66,7 +104,8 @@ def list_serial_ports() -> List[str]:
                         # value is the COM port name (e.g., 'COM5')
                         dev = str(value)
                         # create an entry only if device not already present
-                        if not any(r.get("device") == dev for r in results):
+                        if dev not in seen:
+                            seen.add(dev)
                             results.append({
                                 "device": dev,
                                 "description": f"Registry:{name}",
@@ -93,13 +132,37 @@ class SerialManager:
       mgr.open()
       mgr.send_line('hello')
       mgr.close()
+
+    With `background=True` writes go through a bounded queue drained by a
+    writer thread, so `send_line` never waits on the port. It returns False
+    when the queue is full or the port is closing. A failed background write
+    is reported late: the next `send_line`/`send_lines` returns False (without
+    queueing) and carries the error in `last_error`.
     """
 
-    def __init__(self, port: Optional[str] = None, baud: int = 9600, timeout: float = 1.0):
+    # Bytes the writer thread coalesces into one write
+    WRITE_CHUNK = 4096
+
+    def __init__(self, port: Optional[str] = None, baud: int = 9600, timeout: float = 1.0,
+                 flush: bool = False, background: bool = False, queue_size: int = 256):
         self.port = port
         self.baud = int(baud)
         self.timeout = float(timeout)
+        # wait for the OS buffer to drain after every write (slow; off by default)
+        self.flush = bool(flush)
+        self.background = bool(background)
+        self.queue_size = int(queue_size)
         self._ser = None
+        # background writer state (only while open with background=True)
+        self._q: Optional[queue.Queue] = None
+        self._tx: Optional[threading.Thread] = None
+        # guards _closing so nothing is queued behind the stop sentinel
+        self._q_lock = threading.Lock()
+        self._closing = False
+        # error from the writer thread, reported by the next send
+        self._tx_error: Optional[str] = None
+        # set when close() had to cancel a stalled write; the writer exits
+        self._abort = False
         # human-readable error from last operation
         self.last_error: Optional[str] = None
 
@@ -118,6 +181,8 @@ class SerialManager:
             # ensure port is actually open
             if getattr(self._ser, 'is_open', False):
                 self.last_error = None
+                if self.background:
+                    self._start_writer()
                 return True
             else:
                 self.last_error = 'failed to open port'
@@ -134,8 +199,12 @@ class SerialManager:
             return False
 
     def close(self):
+        aborted = self._stop_writer()
         try:
             if self._ser and self._ser.is_open:
+                # a port that just stalled a write would stall flush() too
+                if not aborted:
+                    self.drain()
                 self._ser.close()
         finally:
             self._ser = None
@@ -146,15 +215,120 @@ class SerialManager:
         if self._ser is None or not getattr(self._ser, 'is_open', False):
             self.last_error = 'port not open'
             return False
+        return self._send(text.encode("utf-8") + _CRLF)
+
+    def send_lines(self, lines: Iterable[str]) -> bool:
+        """Send several lines (each with CRLF) in a single write. Returns True on success."""
+        if self._ser is None or not getattr(self._ser, 'is_open', False):
+            self.last_error = 'port not open'
+            return False
+        encoded = [line.encode("utf-8") for line in lines]
+        return self._send(_CRLF.join(encoded) + _CRLF if encoded else b"")
+
+    def drain(self) -> bool:
+        """Block until written data has left the OS buffer. Returns True on success."""
+        if self._ser is None or not getattr(self._ser, 'is_open', False):
+            return False
         try:
-            payload = (text + "\r\n").encode("utf-8")
-            self._ser.write(payload)
-            # attempt to flush if supported
+            if hasattr(self._ser, 'flush'):
+                self._ser.flush()
+            return True
+        except Exception:
+            return False
+
+    def _send(self, payload: bytes) -> bool:
+        q = self._q
+        if q is None:
+            return self._write(payload)
+        with self._q_lock:
+            if self._closing:
+                self.last_error = 'port closing'
+                return False
+            if self._tx_error is not None:
+                self.last_error, self._tx_error = self._tx_error, None
+                return False
+            try:
+                q.put_nowait(payload)
+                return True
+            except queue.Full:
+                self.last_error = 'send queue full'
+                return False
+
+    def _start_writer(self):
+        self._closing = False
+        self._tx_error = None
+        self._q = queue.Queue(maxsize=max(1, self.queue_size))
+        self._tx = threading.Thread(target=self._writer, args=(self._q,), daemon=True)
+        self._tx.start()
+
+    def _stop_writer(self, timeout: float = 5.0) -> bool:
+        """Stop the writer thread. Returns True if a stalled write had to be cancelled."""
+        q, tx = self._q, self._tx
+        if q is None:
+            return False
+        # sentinel after everything already queued, so pending lines still go out;
+        # a full queue means the port is not keeping up, so don't wait for it
+        with self._q_lock:
+            self._closing = True
             try:
-                if hasattr(self._ser, 'flush'):
-                    self._ser.flush()
-            except Exception:
-                pass
+                q.put_nowait(None)
+                queued = True
+            except queue.Full:
+                queued = False
+        aborted = False
+        if tx is not None:
+            if queued:
+                tx.join(timeout)
+            if tx.is_alive():
+                # still stuck in a write to a stalled port: abort it (pyserial
+                # wakes its select()/overlapped wait), then let the thread exit
+                aborted = True
+                self._abort = True
+                try:
+                    self._ser.cancel_write()
+                except Exception:
+                    pass
+                tx.join(1.0)
+        # only now, so no send falls back to a direct write while the writer runs
+        self._q = self._tx = None
+        self._abort = False
+        return aborted
+
+    def _writer(self, q: queue.Queue):
+        while True:
+            item = q.get()
+            if item is None:
+                return
+            # coalesce whatever else is already waiting into one write
+            chunks = [item]
+            size = len(item)
+            stop = False
+            while size < self.WRITE_CHUNK:
+                try:
+                    nxt = q.get_nowait()
+                except queue.Empty:
+                    break
+                if nxt is None:
+                    stop = True
+                    break
+                chunks.append(nxt)
+                size += len(nxt)
+            if self._ser is not None:
+                try:
+                    self._ser.write(b"".join(chunks))
+                    if self.flush:
+                        self._ser.flush()
+                except Exception as e:
+                    # last_error belongs to the caller's thread; hand it over on the next send
+                    self._tx_error = str(e) or 'write error'
+            if stop or self._abort:
+                return
+
+    def _write(self, payload: bytes) -> bool:
+        try:
+            self._ser.write(payload)
+            if self.flush:
+                self.drain()
             self.last_error = None
             return True
         except Exception:
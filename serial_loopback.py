@@ -7,6 +7,7 @@ Options:
   --pulse-dtr   Pulse DTR for 200ms before sending (some devices need it)
   --pulse-rts   Pulse RTS for 200ms before sending
   --read        Attempt to read response after writing (useful for loopback)
+  --wait        With --read, wait up to 1s for data if none has arrived yet
 """
 import argparse
 import time
@@ -17,6 +18,9 @@ except Exception as e:
     print('pyserial not available:', e)
     raise
 
+# Same open/pulse/send path the GUI uses
+from serial_helper import SerialManager
+
 
 def main():
     ap = argparse.ArgumentParser()
@@ -26,48 +30,55 @@ def main():
     ap.add_argument('--pulse-dtr', action='store_true')
     ap.add_argument('--pulse-rts', action='store_true')
     ap.add_argument('--read', action='store_true')
+    ap.add_argument('--wait', action='store_true')
     args = ap.parse_args()
 
     print(f"Opening {args.port}@{args.baud}...")
+    mgr = SerialManager(args.port, args.baud, timeout=1)
     try:
-        ser = serial.Serial(args.port, args.baud, timeout=1)
+        opened = mgr.open()
     except Exception as e:
         print('Failed to open port:', e)
         return
+    if not opened:
+        print('Failed to open port:', mgr.last_error)
+        return
 
     try:
-        print('Port open:', ser.is_open)
+        print('Port open:', opened)
         if args.pulse_dtr:
-            try:
-                ser.setDTR(True)
-                time.sleep(0.2)
-                ser.setDTR(False)
+            if mgr.pulse_dtr():
                 print('Pulsed DTR')
-            except Exception as e:
-                print('DTR pulse failed:', e)
+            else:
+                print('DTR pulse failed:', mgr.last_error)
         if args.pulse_rts:
-            try:
-                ser.setRTS(True)
-                time.sleep(0.2)
-                ser.setRTS(False)
+            if mgr.pulse_rts():
                 print('Pulsed RTS')
-            except Exception as e:
-                print('RTS pulse failed:', e)
+            else:
+                print('RTS pulse failed:', mgr.last_error)
 
         payload = (args.payload + "\r\n").encode('utf-8')
         print('Writing:', payload)
-        try:
-            n = ser.write(payload)
-            print(f'Wrote {n} bytes')
-        except Exception as e:
-            print('Write failed:', e)
+        if mgr.send_line(args.payload):
+            print(f'Wrote {len(payload)} bytes')
+        else:
+            print('Write failed:', mgr.last_error)
 
         # Give device time to transmit/loopback
         time.sleep(0.2)
 
         if args.read:
+            ser = mgr._ser
             try:
-                data = ser.read(1024)
+                # take what has already arrived; only block for the 1s read
+                # timeout when asked to
+                n = ser.in_waiting
+                if n:
+                    data = ser.read(n)
+                elif args.wait:
+                    data = ser.read(1024)
+                else:
+                    data = b''
                 print('Read:', data, 'len=', len(data))
                 if data:
                     print('Read repr:', repr(data))
@@ -78,7 +89,7 @@ def main():
 
     finally:
         try:
-            ser.close()
+            mgr.close()
         except Exception:
             pass
 
@@ -4,6 +4,9 @@ Usage:
   python serial_test.py           # interactive port selection
   python serial_test.py --port COM3 --baud 9600 --text "Hello"
   python serial_test.py --port COM3 --baud 9600 --text "Hello" --pulse-dtr
+  python serial_test.py --port COM3 --text "one" --text "two" --count 10
+
+All lines (each --text, repeated --count times) are sent in a single write.
 
 This script uses the local `serial_helper.SerialManager` if available, falling
 back to pyserial directly if needed.
@@ -24,6 +27,61 @@ except Exception:
             return []
 
 
+def _encode_lines(lines):
+    """All lines as one CRLF-terminated UTF-8 buffer, for a single write."""
+    return b''.join((t + '\r\n').encode('utf-8') for t in lines)
+
+
+def _open_serial(serial, port, baud):
+    """Open `port` with DTR held low, so opening doesn't reset Arduino-style boards."""
+    ser = serial.Serial()
+    ser.port = port
+    ser.baudrate = baud
+    ser.timeout = 1
+    ser.dsrdtr = False
+    ser.dtr = False
+    ser.open()
+    _set_low_latency(ser)
+    return ser
+
+
+def _set_low_latency(ser):
+    """Ask the driver to push short writes out immediately (Linux ASYNC_LOW_LATENCY).
+
+    pyserial implements the TIOCGSERIAL/TIOCSSERIAL dance as
+    `set_low_latency_mode` on Linux only; elsewhere, or for drivers that
+    reject it, this is a no-op.
+    """
+    fn = getattr(ser, 'set_low_latency_mode', None)
+    if fn is None:
+        return
+    try:
+        fn(True)
+    except Exception:
+        pass
+
+
+def _begin_dtr_pulse(ser, duration: float = 0.2):
+    """Raise DTR and return the monotonic time to drop it, or None on failure."""
+    try:
+        ser.setDTR(True)
+        return time.monotonic() + duration
+    except Exception as e:
+        print('DTR pulse failed:', e)
+        return None
+
+
+def _end_dtr_pulse(ser, deadline):
+    """Drop DTR once `deadline` is reached (whatever time is left of the pulse)."""
+    if deadline is None:
+        return
+    try:
+        time.sleep(max(0.0, deadline - time.monotonic()))
+        ser.setDTR(False)
+    except Exception as e:
+        print('DTR pulse failed:', e)
+
+
 def choose_port_interactive(ports):
     if not ports:
         print("No serial ports detected.")
@@ -49,14 +107,17 @@ def main():
     ap = argparse.ArgumentParser()
     ap.add_argument('--port', help='COM port (e.g. COM3)')
     ap.add_argument('--baud', type=int, default=9600)
-    ap.add_argument('--text', default='TEST: Hello from serial_test.py')
+    ap.add_argument('--text', action='append',
+                    help='Line to send; repeat for several lines (default: a test greeting)')
+    ap.add_argument('--count', type=int, default=1, help='Send the lines this many times')
     ap.add_argument('--pulse-dtr', action='store_true', help='Pulse DTR for 200ms before sending')
     args = ap.parse_args()
+    lines = (args.text or ['TEST: Hello from serial_test.py']) * max(1, args.count)
 
-    ports = list_serial_ports()
     port = args.port
     if not port:
-        port = choose_port_interactive(ports)
+        # only enumerate when the user has to pick a port
+        port = choose_port_interactive(list_serial_ports())
     if not port:
         print('No port selected; exiting.')
         sys.exit(1)
@@ -75,17 +136,14 @@ def main():
 
         if ok:
             try:
+                ser = getattr(mgr, '_ser', None)
+                if ser is not None:
+                    _set_low_latency(ser)
                 if args.pulse_dtr:
-                    try:
-                        ser = getattr(mgr, '_ser', None)
-                        if ser is not None:
-                            ser.setDTR(True)
-                            time.sleep(0.2)
-                            ser.setDTR(False)
-                    except Exception as e:
-                        print('DTR pulse failed:', e)
-                res = mgr.send_line(args.text)
-                print('send_line returned', res)
+                    if ser is not None:
+                        _end_dtr_pulse(ser, _begin_dtr_pulse(ser))
+                res = mgr.send_lines(lines)
+                print('send_lines returned', res)
             finally:
                 mgr.close()
             sys.exit(0 if res else 3)
@@ -98,19 +156,15 @@ def main():
             print('pyserial not installed. Please install with: python -m pip install pyserial')
             sys.exit(2)
         try:
-            ser = serial.Serial(port, baud, timeout=1)
+            ser = _open_serial(serial, port, baud)
         except Exception as e:
             print('Failed to open port via pyserial fallback:', e)
             sys.exit(5)
         try:
-            if args.pulse_dtr:
-                try:
-                    ser.setDTR(True)
-                    time.sleep(0.2)
-                    ser.setDTR(False)
-                except Exception as e:
-                    print('DTR pulse failed:', e)
-            payload = (args.text + '\r\n').encode('utf-8')
+            # the payload is built while DTR is held high
+            deadline = _begin_dtr_pulse(ser) if args.pulse_dtr else None
+            payload = _encode_lines(lines)
+            _end_dtr_pulse(ser, deadline)
             n = ser.write(payload)
             print(f'wrote {n} bytes (fallback)')
             sys.exit(0 if n else 6)
@@ -128,20 +182,16 @@ def main():
         sys.exit(4)
 
     try:
-        ser = serial.Serial(port, baud, timeout=1)
+        ser = _open_serial(serial, port, baud)
     except Exception as e:
         print('Failed to open port via pyserial:', e)
         sys.exit(5)
 
     try:
-        if args.pulse_dtr:
-            try:
-                ser.setDTR(True)
-                time.sleep(0.2)
-                ser.setDTR(False)
-            except Exception as e:
-                print('DTR pulse failed:', e)
-        payload = (args.text + '\r\n').encode('utf-8')
+        # the payload is built while DTR is held high
+        deadline = _begin_dtr_pulse(ser) if args.pulse_dtr else None
+        payload = _encode_lines(lines)
+        _end_dtr_pulse(ser, deadline)
         n = ser.write(payload)
         print(f'wrote {n} bytes')
     except Exception as e:
@@ -47,5 +47,40 @@ class TestBleepText(unittest.TestCase):
         out = mainmod.bleep_text("o'connor is here", bad_set=self.bad)
         self.assertIn('[X]', out)
 
+    def test_whole_hyphenated_token_only(self):
+        # 'law' must not match inside hyphenated tokens
+        bad = {'law'}
+        self.assertEqual(mainmod.bleep_text('my in-law is law-abiding', bad_set=bad),
+                         'my in-law is law-abiding')
+        self.assertEqual(mainmod.bleep_text('the law, the LAW!', bad_set=bad),
+                         'the ****, the ****!')
+
+    def test_apostrophe_tokens(self):
+        bad = {"o'connor", 'connor', 's'}
+        self.assertEqual(mainmod.bleep_text("O'Connor met Connor's dog", bad_set=bad),
+                         "**** met Connor's dog")
+        self.assertEqual(mainmod.bleep_text("it's", bad_set=bad), "it's")
+
+    def test_ascii_and_non_ascii_text(self):
+        bad = {'caf', 'naïve', 'badword'}
+        # non-ASCII text uses Unicode word rules: 'caf' is not a token in 'café'
+        self.assertEqual(mainmod.bleep_text('café badword', bad_set=bad), 'café ****')
+        self.assertEqual(mainmod.bleep_text('so NAÏVE', bad_set=bad), 'so ****')
+        self.assertEqual(mainmod.bleep_text('caf badword', bad_set=bad), '**** ****')
+
+    def test_large_list_matches_small_list(self):
+        # big lists take the per-token path; results must be the same
+        small = {'law', "o'connor", 'badword'}
+        big = small | {f'filler{i}' for i in range(mainmod._BAD_REGEX_MAX_WORDS + 50)}
+        for text in ("my in-law is law-abiding", "O'Connor said BADWORD", "law. Law-law, law"):
+            self.assertEqual(mainmod.bleep_text(text, bad_set=big),
+                             mainmod.bleep_text(text, bad_set=small))
+
+    def test_replaced_set_is_recompiled(self):
+        first = {'alpha'}
+        self.assertEqual(mainmod.bleep_text('alpha beta', bad_set=first), '**** beta')
+        second = {'beta'}
+        self.assertEqual(mainmod.bleep_text('alpha beta', bad_set=second), 'alpha ****')
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,183 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+import serial_helper
+
+
+class _GatedPort:
+    """Stand-in serial port whose writes can be held until `gate` is set."""
+
+    def __init__(self):
+        self.is_open = True
+        self.writes = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.writing = threading.Event()
+        self.cancelled = threading.Event()
+        self.fail = None
+
+    def write(self, data):
+        self.writing.set()
+        while not self.gate.wait(0.01):
+            if self.cancelled.is_set():
+                self.cancelled.clear()
+                raise OSError('write cancelled')
+        if self.fail is not None:
+            raise self.fail
+        self.writes.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        # like tcdrain(): blocks for as long as the port is stalled
+        self.gate.wait()
+
+    def cancel_write(self):
+        self.cancelled.set()
+
+    def close(self):
+        self.is_open = False
+
+
+@unittest.skipIf(serial_helper.serial is None, 'pyserial not installed')
+class TestSerialManager(unittest.TestCase):
+    def _open(self, port, **kwargs):
+        mgr = serial_helper.SerialManager('TEST', 9600, **kwargs)
+        with mock.patch.object(serial_helper.serial, 'Serial', return_value=port):
+            self.assertTrue(mgr.open())
+        return mgr
+
+    def _hold_writer(self, mgr, port):
+        # park the writer inside its first write so later lines queue up
+        port.gate.clear()
+        self.assertTrue(mgr.send_line('first'))
+        self.assertTrue(port.writing.wait(2.0))
+
+    def test_loop_roundtrip(self):
+        port = serial_helper.serial.serial_for_url('loop://', timeout=1)
+        mgr = self._open(port)
+        self.assertTrue(mgr.send_line('hello'))
+        self.assertTrue(mgr.send_lines(['a', 'b']))
+        self.assertEqual(port.read(port.in_waiting), b'hello\r\na\r\nb\r\n')
+        mgr.close()
+
+    def test_send_lines_single_write(self):
+        port = _GatedPort()
+        mgr = self._open(port)
+        self.assertTrue(mgr.send_lines(['one', 'two', 'three']))
+        self.assertEqual(port.writes, [b'one\r\ntwo\r\nthree\r\n'])
+        mgr.close()
+
+    def test_background_order_and_coalescing(self):
+        port = _GatedPort()
+        mgr = self._open(port, background=True)
+        self._hold_writer(mgr, port)
+        for i in range(5):
+            self.assertTrue(mgr.send_line(f'line{i}'))
+        port.gate.set()
+        mgr.close()
+        self.assertEqual(port.writes[0], b'first\r\n')
+        # everything queued behind the blocked write goes out as one write
+        self.assertEqual(port.writes[1:], [b''.join(f'line{i}\r\n'.encode() for i in range(5))])
+
+    def test_queue_full_returns_false(self):
+        port = _GatedPort()
+        mgr = self._open(port, background=True, queue_size=2)
+        self._hold_writer(mgr, port)
+        self.assertTrue(mgr.send_line('a'))
+        self.assertTrue(mgr.send_line('b'))
+        self.assertFalse(mgr.send_line('c'))
+        self.assertEqual(mgr.last_error, 'send queue full')
+        port.gate.set()
+        # let the writer catch up; close() with a full queue would cancel instead
+        deadline = time.monotonic() + 2.0
+        while len(port.writes) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        mgr.close()
+        self.assertEqual(b''.join(port.writes), b'first\r\na\r\nb\r\n')
+
+    def test_close_flushes_pending_lines(self):
+        port = _GatedPort()
+        mgr = self._open(port, background=True)
+        self._hold_writer(mgr, port)
+        self.assertTrue(mgr.send_lines(['x', 'y']))
+        self.assertTrue(mgr.send_line('z'))
+        threading.Timer(0.1, port.gate.set).start()
+        mgr.close()
+        self.assertEqual(b''.join(port.writes), b'first\r\nx\r\ny\r\nz\r\n')
+        self.assertFalse(port.is_open)
+
+    def test_stalled_write_is_cancelled(self):
+        port = _GatedPort()
+        mgr = self._open(port, background=True)
+        self._hold_writer(mgr, port)
+        writer = mgr._tx
+        # the gate is never opened; stopping must fall back to cancel_write()
+        self.assertTrue(mgr._stop_writer(timeout=0.2))
+        self.assertFalse(writer.is_alive())
+        port.gate.set()
+        mgr.close()
+
+    def test_close_on_stalled_port_does_not_flush(self):
+        port = _GatedPort()
+        mgr = self._open(port, background=True)
+        self._hold_writer(mgr, port)
+        writer = mgr._tx
+        done = threading.Event()
+        threading.Thread(target=lambda: (mgr.close(), done.set()), daemon=True).start()
+        # join(5) + cancel + join(1); flush() would block forever on this port
+        self.assertTrue(done.wait(8.0))
+        self.assertFalse(writer.is_alive())
+        self.assertFalse(port.is_open)
+
+    def test_stop_with_full_queue_cancels_immediately(self):
+        port = _GatedPort()
+        mgr = self._open(port, background=True, queue_size=1)
+        self._hold_writer(mgr, port)
+        self.assertTrue(mgr.send_line('a'))
+        writer = mgr._tx
+        start = time.monotonic()
+        self.assertTrue(mgr._stop_writer(timeout=5.0))
+        self.assertLess(time.monotonic() - start, 2.0)
+        self.assertFalse(writer.is_alive())
+        self.assertEqual(port.writes, [])
+        port.gate.set()
+        mgr.close()
+
+    def test_send_while_closing_is_refused(self):
+        port = _GatedPort()
+        mgr = self._open(port, background=True)
+        self._hold_writer(mgr, port)
+        self.assertTrue(mgr.send_line('queued'))
+        closer = threading.Thread(target=mgr.close)
+        closer.start()
+        deadline = time.monotonic() + 2.0
+        while not mgr._closing and time.monotonic() < deadline:
+            time.sleep(0.01)
+        # must not bypass the queue with a direct write while the writer drains
+        self.assertFalse(mgr.send_line('late'))
+        self.assertEqual(mgr.last_error, 'port closing')
+        port.gate.set()
+        closer.join(2.0)
+        self.assertEqual(b''.join(port.writes), b'first\r\nqueued\r\n')
+
+    def test_background_write_error_reported_on_next_send(self):
+        port = _GatedPort()
+        mgr = self._open(port, background=True)
+        self._hold_writer(mgr, port)
+        port.fail = OSError('device unplugged')
+        port.gate.set()
+        deadline = time.monotonic() + 2.0
+        while mgr._tx_error is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertFalse(mgr.send_line('next'))
+        self.assertEqual(mgr.last_error, 'device unplugged')
+        port.fail = None
+        self.assertTrue(mgr.send_line('again'))
+        mgr.close()
+        self.assertEqual(port.writes, [b'again\r\n'])
+
+
+if __name__ == '__main__':
+    unittest.main()
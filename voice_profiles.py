@@ -199,25 +199,32 @@ class VoiceProfileManager:
         # Prefer librosa if available (better resampling and MFCC), otherwise use fallback
         if HAS_LIBROSA:
             y, sr = librosa.load(wav_path, sr=self.sample_rate, mono=True)
-            mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=self.n_mfcc)
         else:
             # lightweight fallback: read with soundfile if available, otherwise use builtin reader
             y, sr = self._read_wav(wav_path)
-            # promote to mono
-            if y.ndim > 1:
-                y = np.mean(y, axis=1)
-            # resample if needed (simple linear interpolation)
-            if sr != self.sample_rate:
-                # naive resample
-                import math
-
+        return self._embedding_from_signal(y, sr)
+
+    def _embedding_from_signal(self, y: np.ndarray, sr: int) -> np.ndarray:
+        """Compute the normalized embedding for a float signal in -1..1."""
+        # promote to mono
+        if y.ndim > 1:
+            y = np.mean(y, axis=1)
+        # resample if needed
+        if sr != self.sample_rate:
+            if HAS_LIBROSA:
+                y = librosa.resample(y, orig_sr=sr, target_sr=self.sample_rate)
+            else:
+                # naive resample (simple linear interpolation)
                 ratio = float(self.sample_rate) / float(sr)
                 n = int(math.ceil(len(y) * ratio))
                 x_old = np.arange(len(y))
                 x_new = np.linspace(0, len(y) - 1, n)
                 y = np.interp(x_new, x_old, y).astype(np.float32)
-                sr = self.sample_rate
+            sr = self.sample_rate
 
+        if HAS_LIBROSA:
+            mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=self.n_mfcc)
+        else:
             mfcc = self._mfcc_fallback(y, sr, n_mfcc=self.n_mfcc)
 
         # stats
@@ -616,7 +623,20 @@ class VoiceProfileManager:
 
     def match_profile(self, wav_path: str, top_k: int = 1) -> List[Tuple[str, float]]:
         """Return top_k matching profiles as list of (name, score) where score is cosine similarity [0..1]."""
-        emb = self._extract_embedding(wav_path)
+        return self._rank_profiles(self._extract_embedding(wav_path), top_k)
+
+    def match_profile_samples(self, samples: np.ndarray, sample_rate: Optional[int] = None, top_k: int = 1) -> List[Tuple[str, float]]:
+        """Like `match_profile`, but for in-memory mono int16 (or float) samples.
+
+        Avoids writing a temporary WAV file for live audio.
+        """
+        y = np.asarray(samples)
+        if y.dtype == np.int16:
+            y = y.astype(np.float32) / 32768.0
+        sr = int(sample_rate) if sample_rate else self.sample_rate
+        return self._rank_profiles(self._embedding_from_signal(y, sr), top_k)
+
+    def _rank_profiles(self, emb: np.ndarray, top_k: int) -> List[Tuple[str, float]]:
         scores = []
         for name, meta in self._index.items():
             # profile can be stored in its folder with embedding.npy